@@ -0,0 +1,59 @@
+"""Время ответа списка постов в админке на большой таблице.
+
+    python benchmarks/admin_changelist.py --rows 1000000
+
+Меряет первую и дальнюю страницы, поиск и переходы date_hierarchy
+и печатает p50/p95/p99 (мс) и число SQL-запросов на запрос.
+"""
+import argparse
+import json
+
+from utils import measure, seed, setup_django, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django('admin_%s.sqlite3' % args.rows)
+    seed(args.rows)
+
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from posts.models import Post, User
+
+    admin, _ = User.objects.get_or_create(
+        username='bench_admin', defaults={'is_staff': True,
+                                          'is_superuser': True})
+    client = Client()
+    client.force_login(admin)
+    url = reverse('admin:posts_post_changelist')
+    last = Post.objects.order_by('-pub_date').values_list(
+        'pub_date', flat=True).first()
+    cases = {
+        'list': {},
+        'page_100': {'p': 100},
+        'search': {'q': 'котики кофе'},
+        'year': {'pub_date__year': last.year},
+        'month': {'pub_date__year': last.year,
+                  'pub_date__month': last.month},
+    }
+
+    report = {'rows': args.rows, 'cases': {}}
+    for name, params in cases.items():
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code == 200, (name, response.status_code)
+        query_count = len(queries)
+        timings = measure(lambda: client.get(url, params), args.repeat)
+        report['cases'][name] = dict(summary(timings), queries=query_count)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
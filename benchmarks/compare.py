@@ -0,0 +1,53 @@
+"""Сравнивает два отчёта benchmarks/views.py.
+
+    python benchmarks/compare.py old.json new.json --threshold 20
+
+Печатает замеры, у которых p95 изменился больше чем на threshold
+процентов или изменилось число запросов; с --fail-on-regression
+завершается с кодом 1, если что-то стало хуже.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=20)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    print('%s -> %s' % (old.get('commit'), new.get('commit')))
+    regressions = 0
+    for size, cases in new['sizes'].items():
+        for name, result in cases.items():
+            before = old['sizes'].get(size, {}).get(name)
+            if before is None:
+                continue
+            change = (result['p95'] - before['p95']) / before['p95'] * 100 \
+                if before['p95'] else 0
+            queries = result['queries'] - before['queries']
+            if abs(change) < args.threshold and not queries:
+                continue
+            worse = change >= args.threshold or queries > 0
+            regressions += worse
+            print('%s %-8s %-28s p95 %8.2f -> %8.2f мс (%+.0f%%), '
+                  'запросов %s -> %s' % (
+                      '!' if worse else ' ', size, name, before['p95'],
+                      result['p95'], change, before['queries'],
+                      result['queries']))
+    print('Ухудшений: %s' % regressions)
+    if args.fail_on_regression and regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Пропускная способность очереди фоновых задач (core.jobs) на SQLite.
+
+    python benchmarks/jobs.py --jobs 20000 --workers 1 2 4 8 \
+        --batch-sizes 1 20 100
+
+Для каждой пары (воркеров, размер пачки) очередь заполняется
+enqueue_many и разбирается процессами run_workers --once. Печатается
+скорость постановки и выполнения в задачах в секунду. Задача noop
+ничего не делает и меряет накладные расходы самой очереди, write --
+делает одну короткую запись, как обновление счётчика.
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+from utils import setup_django
+
+LEASE_SECONDS = 300
+
+
+def noop(number):
+    pass
+
+
+def write(number):
+    from django.db.models import F
+
+    from posts.models import Group
+    Group.objects.filter(slug='bench-jobs').update(
+        post_count=F('post_count') + 1)
+
+
+def drain(batch_size):
+    from core.jobs import work
+    work(batch_size, LEASE_SECONDS, interval=0, once=True)
+
+
+def run(kind, jobs, workers, batch_size):
+    from django.db import connections
+
+    from core.jobs import enqueue_many
+    from core.models import Job
+
+    Job.objects.all().delete()
+    started = time.perf_counter()
+    enqueue_many('bench.' + kind, ([i] for i in range(jobs)))
+    enqueued = time.perf_counter() - started
+
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=drain, args=(batch_size,))
+        for _ in range(workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+    assert not Job.objects.exists(), 'Очередь не разобрана'
+    return {
+        'enqueue_per_second': round(jobs / enqueued),
+        'jobs_per_second': round(jobs / elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument(
+        '--batch-sizes', type=int, nargs='+', default=[1, 20, 100])
+    parser.add_argument(
+        '--kind', choices=('noop', 'write'), nargs='+',
+        default=['noop', 'write'])
+    args = parser.parse_args()
+
+    setup_django('jobs.sqlite3')
+    from core.jobs import task
+    from posts.models import Group
+    task(noop, name='bench.noop')
+    task(write, name='bench.write')
+    Group.objects.get_or_create(
+        slug='bench-jobs', defaults={'title': 'Задачи'})
+
+    report = {'jobs': args.jobs, 'results': []}
+    for kind in args.kind:
+        for workers in args.workers:
+            for batch_size in args.batch_sizes:
+                result = run(kind, args.jobs, workers, batch_size)
+                result.update(
+                    kind=kind, workers=workers, batch_size=batch_size)
+                report['results'].append(result)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
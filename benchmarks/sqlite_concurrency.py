@@ -0,0 +1,118 @@
+"""Чтение и запись из нескольких процессов: обычный и настроенный SQLite.
+
+    python benchmarks/sqlite_concurrency.py --workers 8 --seconds 10
+
+Каждый воркер в цикле читает первую страницу ленты или создаёт пост
+(доля записей -- --writes) и после каждой операции закрывает старые
+соединения, как после HTTP-запроса. Для каждой конфигурации печатаются
+чтения и записи в секунду, перцентили задержки записи (мс) и число
+ошибок «database is locked».
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from utils import seed, setup_django, summary
+
+CONFIGS = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {},
+    },
+    'tuned': {
+        'ENGINE': 'core.backends.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {'pragmas': {}},
+    },
+}
+
+
+def db_name(config):
+    return 'concurrency_%s.sqlite3' % config
+
+
+def prepare(config, posts):
+    setup_django(db_name(config), **CONFIGS[config])
+    seed(posts, authors=100, groups=10)
+    if config == 'default':
+        # journal_mode хранится в файле базы: возвращаем обычный журнал
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode = delete')
+
+
+def worker(config, seconds, writes, queue):
+    setup_django(db_name(config), migrate=False, **CONFIGS[config])
+
+    from django.db import OperationalError, close_old_connections
+
+    from posts.models import Post, User
+
+    author = User.objects.filter(username__startswith='bench_user_').first()
+    close_old_connections()
+    reads, write_timings, errors = 0, [], 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if random.random() < writes:
+                started = time.perf_counter()
+                Post.objects.create(author=author, text='Новый пост')
+                write_timings.append((time.perf_counter() - started) * 1000)
+            else:
+                list(Post.objects.feed()[:10])
+                reads += 1
+        except OperationalError:
+            errors += 1
+        close_old_connections()
+    queue.put((reads, write_timings, errors))
+
+
+def run(config, args):
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=prepare, args=(config, args.posts))
+    process.start()
+    process.join()
+
+    queue = context.Queue()
+    workers = [
+        context.Process(
+            target=worker, args=(config, args.seconds, args.writes, queue))
+        for _ in range(args.workers)
+    ]
+    for process in workers:
+        process.start()
+    results = [queue.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    write_timings = sum((timings for _, timings, _ in results), [])
+    return {
+        'reads_per_second': round(
+            sum(reads for reads, _, _ in results) / args.seconds, 1),
+        'writes_per_second': round(len(write_timings) / args.seconds, 1),
+        'write_ms': summary(write_timings) if write_timings else None,
+        'locked_errors': sum(errors for _, _, errors in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--writes', type=float, default=0.2)
+    parser.add_argument('--posts', type=int, default=10000)
+    args = parser.parse_args()
+
+    report = {
+        'workers': args.workers,
+        'writes': args.writes,
+        'configs': {config: run(config, args) for config in CONFIGS},
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
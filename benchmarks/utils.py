@@ -0,0 +1,123 @@
+"""Общие части бенчмарков: отдельная база SQLite, наполнение и замеры.
+
+Бенчмарки не трогают рабочую db.sqlite3: каждая база лежит
+в benchmarks/.data/ и дополняется до нужного числа постов.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'yatube')
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+
+WORDS = (
+    'котики', 'собачки', 'погода', 'город', 'книга', 'музыка', 'кино',
+    'python', 'django', 'sqlite', 'утро', 'вечер', 'поезд', 'море',
+    'горы', 'лес', 'кофе', 'работа', 'отпуск', 'новости',
+)
+# Посты идут с этого момента с шагом SECONDS_BETWEEN_POSTS
+FIRST_POST_AT = '2015-01-01 00:00:00'
+SECONDS_BETWEEN_POSTS = 300
+
+
+def setup_django(db_name, migrate=True, **database):
+    """Настраивает Django на базу benchmarks/.data/<db_name>.
+
+    database -- ключи DATABASES['default'], которые нужно заменить.
+    """
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+    from django.conf import settings
+    settings.DATABASES['default'].update(
+        database, NAME=os.path.join(DATA_DIR, db_name))
+    settings.DEBUG = False
+
+    import django
+    django.setup()
+
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+
+
+def seed(posts, authors=1000, groups=100, batch_size=10000):
+    """Дополняет базу до posts постов от authors авторов в groups группах.
+
+    Каждый третий пост без группы. Даты публикации растут вместе с id,
+    чтобы лента и date_hierarchy охватывали несколько лет.
+    """
+    from django.db import connection
+
+    from posts.models import Group, Post, User
+
+    existing = Post.objects.count()
+    if existing >= posts:
+        return
+    User.objects.bulk_create([
+        User(username='bench_user_%s' % i)
+        for i in range(User.objects.filter(
+            username__startswith='bench_user_').count(), authors)
+    ])
+    Group.objects.bulk_create([
+        Group(title='Группа %s' % i, slug='bench-group-%s' % i,
+              description='Группа для бенчмарков')
+        for i in range(Group.objects.filter(
+            slug__startswith='bench-group-').count(), groups)
+    ])
+    author_ids = list(User.objects.filter(
+        username__startswith='bench_user_').values_list('id', flat=True))
+    group_ids = list(Group.objects.filter(
+        slug__startswith='bench-group-').values_list('id', flat=True))
+
+    started = time.perf_counter()
+    for start in range(existing, posts, batch_size):
+        Post.objects.bulk_create([
+            Post(
+                text=' '.join(random.Random(i).choices(WORDS, k=12)),
+                author_id=author_ids[i % len(author_ids)],
+                group_id=group_ids[i % len(group_ids)] if i % 3 else None,
+            )
+            for i in range(start, min(start + batch_size, posts))
+        ])
+        print('  %s/%s постов' % (min(start + batch_size, posts), posts),
+              file=sys.stderr)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE posts_post SET "
+            "pub_date = datetime(%s, '+' || (id * %s) || ' seconds'), "
+            "updated_at = datetime(%s, '+' || (id * %s) || ' seconds') "
+            "WHERE id > %s",
+            [FIRST_POST_AT, SECONDS_BETWEEN_POSTS,
+             FIRST_POST_AT, SECONDS_BETWEEN_POSTS, existing])
+    print('Наполнение: %.1f c' % (time.perf_counter() - started),
+          file=sys.stderr)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * len(ordered))))
+    return ordered[index]
+
+
+def summary(timings):
+    """Перцентили и среднее по списку замеров в миллисекундах."""
+    return {
+        'p50': round(percentile(timings, 50), 2),
+        'p95': round(percentile(timings, 95), 2),
+        'p99': round(percentile(timings, 99), 2),
+        'mean': round(statistics.mean(timings), 2),
+    }
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
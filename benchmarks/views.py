@@ -0,0 +1,186 @@
+"""Время ответа, число запросов и пиковая память страниц posts.urls.
+
+    python benchmarks/views.py --sizes 10000 100000 1000000 \
+        --output benchmarks/.data/report.json
+
+База растёт от меньшего размера к большему, и на каждом размере
+меряются все адреса posts/urls.py: ленты на первой, средней и последней
+странице (номерами и курсором), пост, поиск, формы и выгрузки.
+Отчёт -- JSON; два отчёта сравнивает benchmarks/compare.py.
+"""
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import tracemalloc
+
+from utils import BENCH_DIR, measure, seed, setup_django, summary
+
+AUTHORS = 1000
+GROUPS = 100
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def page_numbers(count):
+    last = max(1, math.ceil(count / 10))
+    return {'first': 1, 'middle': max(1, last // 2), 'last': last}
+
+
+def cursors(queryset, count):
+    """Курсоры первой, средней и последней страниц ленты."""
+    from yatube.utils import CURSOR_NEXT, encode_cursor
+
+    ordered = queryset.order_by('-pub_date', '-id')
+    result = {'first': ''}
+    for name, offset in (('middle', count // 2), ('last', count - 11)):
+        if offset < 1:
+            continue
+        row = ordered.values_list('pub_date', 'id')[offset - 1]
+        result[name] = encode_cursor(CURSOR_NEXT, row)
+    return result
+
+
+def build_cases():
+    """Имя замера -> (клиент, адрес, параметры)."""
+    from django.test import Client
+    from django.urls import reverse
+
+    from posts.models import Group, Post, User
+
+    author = User.objects.get(username='bench_user_0')
+    group = Group.objects.get(slug='bench-group-1')
+    staff, _ = User.objects.get_or_create(
+        username='bench_admin', defaults={'is_staff': True,
+                                          'is_superuser': True})
+    post = author.posts.order_by('-pub_date').first()
+
+    guest = Client()
+    author_client = Client()
+    author_client.force_login(author)
+    staff_client = Client()
+    staff_client.force_login(staff)
+
+    feeds = {
+        'index': (reverse('posts:index'), Post.objects.all(),
+                  Post.objects.count()),
+        'group_list': (
+            reverse('posts:group_list', args=(group.slug,)),
+            group.posts.all(), group.post_count),
+        'profile': (
+            reverse('posts:profile', args=(author.username,)),
+            author.posts.all(), author.post_counter.post_count),
+    }
+    cases = {}
+    for name, (url, queryset, count) in feeds.items():
+        for page, number in page_numbers(count).items():
+            cases['%s_page_%s' % (name, page)] = (
+                guest, url, {'page': number})
+        for page, cursor in cursors(queryset, count).items():
+            cases['%s_cursor_%s' % (name, page)] = (
+                guest, url, {'cursor': cursor})
+    cases.update({
+        'post_detail': (
+            guest, reverse('posts:post_detail', args=(post.pk,)), {}),
+        'search': (guest, reverse('posts:search'), {'q': 'котики кофе'}),
+        'post_create': (author_client, reverse('posts:post_create'), {}),
+        'post_edit': (
+            author_client, reverse('posts:post_edit', args=(post.pk,)), {}),
+        'profile_export': (
+            author_client,
+            reverse('posts:profile_export', args=(author.username,)), {}),
+        'group_export': (
+            author_client,
+            reverse('posts:group_export', args=(group.slug,)), {}),
+        'export': (staff_client, reverse('posts:export'), {}),
+    })
+    return cases
+
+
+def request(client, url, params):
+    response = client.get(url, params)
+    assert response.status_code == 200, (url, response.status_code)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def run_case(client, url, params, repeat, warm):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def run():
+        if not warm:
+            cache.clear()
+        request(client, url, params)
+
+    run()
+    with CaptureQueriesContext(connection) as queries:
+        run()
+    query_count = len(queries)
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = summary(measure(run, repeat))
+    result.update(queries=query_count, peak_kb=round(peak / 1024))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument(
+        '--export-repeat', type=int, default=3,
+        help='Повторов для выгрузок, которые читают всю область.')
+    parser.add_argument(
+        '--warm', action='store_true',
+        help='Не очищать кэш перед запросом.')
+    parser.add_argument('--output', help='Файл отчёта; по умолчанию stdout.')
+    args = parser.parse_args()
+
+    setup_django('views.sqlite3')
+    from django.conf import settings
+    settings.FEED_CACHE_SECONDS = 60 if args.warm else 0
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'warm': args.warm,
+        'sizes': {},
+    }
+    for size in sorted(args.sizes):
+        seed(size, authors=AUTHORS, groups=GROUPS)
+        cases = {}
+        for name, (client, url, params) in build_cases().items():
+            repeat = args.export_repeat if 'export' in name else args.repeat
+            cases[name] = run_case(client, url, params, repeat, args.warm)
+            print('%s %s: p95 %s мс' % (size, name, cases[name]['p95']),
+                  file=sys.stderr)
+        report['sizes'][str(size)] = cases
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as target:
+            target.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import gzip
+import json
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+class FeedApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='TestUser', first_name='Имя', last_name='Фамилия')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        Post.objects.bulk_create([Post(
+            author=cls.author,
+            text='Тестовый текст %s' % i,
+            group=cls.group if i % 2 else None,
+        ) for i in range(25)])
+        cls.post = Post.objects.filter(group=cls.group).first()
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def get(self, url, **params):
+        response = self.guest_client.get(url, params)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response.status_code, json.loads(response.content)
+
+    def test_feeds(self):
+        """Ленты отдают посты по курсору за постоянное число запросов."""
+        feeds = (
+            (reverse('api:index'), 25, 1),
+            (reverse('api:group_list', args=(self.group.slug,)), 12, 2),
+            (reverse('api:profile', args=(self.author.username,)), 25, 2),
+        )
+        for url, total, queries in feeds:
+            with self.subTest(url=url):
+                ids = []
+                params = {}
+                while True:
+                    with self.assertNumQueries(queries):
+                        status, data = self.get(url, **params)
+                    self.assertEqual(status, 200)
+                    ids += [row['id'] for row in data['results']]
+                    if data['next'] is None:
+                        break
+                    params = {'cursor': data['next']}
+                self.assertEqual(len(ids), total)
+                self.assertEqual(ids, sorted(ids, reverse=True))
+                status, data = self.get(url, cursor=data['previous'])
+                self.assertEqual(len(data['results']), 10)
+
+    def test_post_shape(self):
+        """Пост и шапки лент содержат нужные поля."""
+        status, data = self.get(
+            reverse('api:post_detail', args=(self.post.pk,)))
+        self.assertEqual(set(data), {
+            'id', 'text', 'pub_date', 'author', 'group'})
+        self.assertEqual(data['author'], self.author.username)
+        self.assertEqual(data['group'], self.group.slug)
+        status, data = self.get(
+            reverse('api:profile', args=(self.author.username,)), limit=1)
+        self.assertEqual(data['author'], {
+            'username': 'TestUser', 'full_name': 'Имя Фамилия',
+            'post_count': 25})
+        self.assertEqual(len(data['results']), 1)
+        status, data = self.get(
+            reverse('api:group_list', args=(self.group.slug,)))
+        self.assertEqual(data['group']['title'], self.group.title)
+
+    def test_not_found(self):
+        """Несуществующие объекты -- 404 в JSON."""
+        url_list = (
+            reverse('api:post_detail', args=(0,)),
+            reverse('api:group_list', args=('unknown',)),
+            reverse('api:profile', args=('unknown',)),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                status, data = self.get(url)
+                self.assertEqual(status, 404)
+                self.assertIn('detail', data)
+
+    def test_gzip(self):
+        """Ответ сжимается, если клиент это поддерживает."""
+        response = self.guest_client.get(
+            reverse('api:index'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(data['results']), 10)
@@ -0,0 +1,94 @@
+from django.http import JsonResponse
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_safe
+
+from posts.models import Group, Post, User, get_post_count
+from yatube.settings import POSTS_ON_PAGE
+from yatube.utils import KeysetPaginator
+
+# Поле поста в ответе -> столбец values(), из которого оно берётся
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+MAX_LIMIT = 100
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={
+        'ensure_ascii': False, 'separators': (',', ':')})
+
+
+def not_found(detail):
+    return json_response({'detail': detail}, status=404)
+
+
+def post_rows(queryset):
+    """Посты словарями из values(), без создания объектов моделей."""
+    return queryset.values(*POST_FIELDS.values())
+
+
+def serialize(row):
+    return {name: row[column] for name, column in POST_FIELDS.items()}
+
+
+def feed_response(request, queryset, **extra):
+    """Страница ленты по непрозрачному курсору ?cursor= и ?limit=."""
+    try:
+        limit = int(request.GET.get('limit', POSTS_ON_PAGE))
+    except ValueError:
+        limit = POSTS_ON_PAGE
+    paginator = KeysetPaginator(
+        post_rows(queryset), min(max(limit, 1), MAX_LIMIT))
+    page = paginator.get_page(request.GET.get('cursor'))
+    return json_response({
+        **extra,
+        'results': [serialize(row) for row in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@require_safe
+@gzip_page
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@require_safe
+@gzip_page
+def group_posts(request, slug):
+    group = Group.objects.filter(slug=slug).first()
+    if group is None:
+        return not_found('Группа не найдена')
+    return feed_response(request, group.posts.all(), group={
+        'slug': group.slug,
+        'title': group.title,
+        'description': group.description,
+    })
+
+
+@require_safe
+@gzip_page
+def profile(request, username):
+    user = User.objects.select_related('post_counter').filter(
+        username=username).first()
+    if user is None:
+        return not_found('Автор не найден')
+    return feed_response(request, user.posts.all(), author={
+        'username': user.username,
+        'full_name': user.get_full_name(),
+        'post_count': get_post_count(user),
+    })
+
+
+@require_safe
+@gzip_page
+def post_detail(request, post_id):
+    row = post_rows(Post.objects.filter(pk=post_id)).first()
+    if row is None:
+        return not_found('Пост не найден')
+    return json_response(serialize(row))
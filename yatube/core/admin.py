@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from .models import Job, OutgoingEmail
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'subject', 'recipients', 'status', 'attempts', 'created_at',
+        'sent_at', 'next_attempt_at')
+    list_filter = ('status',)
+    exclude = ('message', 'claim')
+    readonly_fields = (
+        'subject', 'recipients', 'status', 'attempts', 'created_at',
+        'sent_at', 'next_attempt_at', 'last_error')
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'name', 'priority', 'status', 'attempts', 'run_at',
+        'created_at')
+    list_filter = ('status', 'name')
+    exclude = ('claim',)
+    readonly_fields = ('attempts', 'created_at', 'last_error')
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Job, JobAdmin)
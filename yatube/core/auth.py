@@ -0,0 +1,52 @@
+import pickle
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .local_cache import LocalCache
+
+local_users = LocalCache()
+
+
+def user_cache_key(user_id):
+    return 'auth_user:%s' % user_id
+
+
+def cache_user(user):
+    """Кладёт пользователя в оба уровня кэша (запись насквозь)."""
+    key = user_cache_key(user.pk)
+    cache.set(key, user, settings.AUTH_USER_CACHE_SECONDS)
+    local_users.set(key, pickle.dumps(user), settings.LOCAL_CACHE_SECONDS)
+
+
+def forget_user(user_id):
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    local_users.delete(key)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кэша процесса
+    или общего кэша, а не из базы на каждый запрос.
+
+    Кэш обновляется при каждом сохранении пользователя (вход, выход,
+    смена пароля) -- см. core.signals.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        # В памяти процесса -- pickle: каждый запрос получает свою копию
+        pickled = local_users.get(key)
+        if pickled is not None:
+            user = pickle.loads(pickled)
+        else:
+            user = cache.get(key)
+            if user is None:
+                user = super().get_user(user_id)
+                if user is None:
+                    return None
+                cache.set(key, user, settings.AUTH_USER_CACHE_SECONDS)
+            local_users.set(
+                key, pickle.dumps(user), settings.LOCAL_CACHE_SECONDS)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,35 @@
+from django.db.backends.sqlite3 import base
+
+# PRAGMA для каждого нового соединения; переопределяются
+# ключом 'pragmas' в OPTIONS базы
+DEFAULT_PRAGMAS = {
+    # Читатели не ждут писателя, писатель не ждёт читателей
+    'journal_mode': 'wal',
+    # Сколько миллисекунд ждать блокировки вместо «database is locked»
+    'busy_timeout': 5000,
+    # В режиме WAL fsync только на контрольных точках
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение -- размер в КиБ
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с настройками для нескольких процессов-воркеров."""
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = {
+            **DEFAULT_PRAGMAS,
+            **self.settings_dict['OPTIONS'].get('pragmas', {}),
+        }
+        for name, value in pragmas.items():
+            connection.execute('PRAGMA %s = %s' % (name, value))
+        return connection
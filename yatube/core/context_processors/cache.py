@@ -0,0 +1,7 @@
+from django.conf import settings
+
+
+def cache_timeouts(request):
+    return {
+        'post_card_cache_seconds': settings.POST_CARD_CACHE_SECONDS
+    }
@@ -0,0 +1,4 @@
+# Методы, которые не изменяют данные (как в CsrfViewMiddleware): их
+# не ограничивает core.ratelimit, а ReplicaPinMiddleware отпускает
+# читать из реплик
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
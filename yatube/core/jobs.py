@@ -0,0 +1,170 @@
+import json
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+# Имя задачи -> функция; заполняется декоратором task
+registry = {}
+ENQUEUE_BATCH_SIZE = 500
+
+
+def task(func=None, *, name=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    Имя по умолчанию -- «модуль.функция»; под этим именем задача лежит
+    в очереди, поэтому перед переименованием очередь нужно разобрать.
+    """
+    def register(func):
+        func.task_name = name or '%s.%s' % (
+            func.__module__, func.__qualname__)
+        registry[func.task_name] = func
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def discover():
+    """Импортирует модули jobs.py всех приложений, чтобы заполнить
+    реестр задач."""
+    autodiscover_modules('jobs')
+
+
+def build_job(task, args=(), kwargs=None, priority=0, delay=0):
+    name = task if isinstance(task, str) else task.task_name
+    return Job(
+        name=name,
+        payload=json.dumps({'args': list(args), 'kwargs': kwargs or {}}),
+        priority=priority,
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def enqueue(task, args=(), kwargs=None, priority=0, delay=0):
+    """Ставит задачу в очередь.
+
+    task -- функция с декоратором task или её имя; аргументы должны
+    сериализоваться в JSON. Внутри транзакции задача станет видна
+    воркерам только после её фиксации.
+    """
+    job = build_job(task, args, kwargs, priority, delay)
+    job.save()
+    return job
+
+
+def enqueue_many(task, calls, priority=0, delay=0):
+    """Ставит в очередь по задаче на каждый элемент calls одним
+    INSERT на пачку.
+
+    Элемент calls -- список позиционных аргументов или словарь
+    именованных.
+    """
+    jobs = [
+        build_job(task, kwargs=call, priority=priority, delay=delay)
+        if isinstance(call, dict) else
+        build_job(task, call, priority=priority, delay=delay)
+        for call in calls
+    ]
+    return Job.objects.bulk_create(jobs, batch_size=ENQUEUE_BATCH_SIZE)
+
+
+def claim_batch(size, lease_seconds):
+    """Захватывает до size задач, которые пора выполнять, начиная
+    с наибольшего приоритета.
+
+    Захват -- один UPDATE с подзапросом и уникальной меткой: на SQLite
+    это одна короткая запись, а условие очереди проверяется в нём
+    заново, так что два воркера не получат одну задачу. Задачи воркера,
+    упавшего посреди пачки, снова доступны через lease_seconds.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(
+        status__in=(Job.QUEUED, Job.RUNNING), run_at__lte=now)
+    claim = uuid.uuid4().hex
+    claimed = due.filter(
+        id__in=due.order_by('-priority', 'run_at', 'id').values('id')[:size]
+    ).update(
+        status=Job.RUNNING, claim=claim, attempts=F('attempts') + 1,
+        run_at=now + timedelta(seconds=lease_seconds))
+    if not claimed:
+        return []
+    return list(Job.objects.filter(claim=claim).order_by('-priority', 'id'))
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка: base, 2*base, 4*base... до максимума."""
+    return min(
+        settings.JOBS_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOBS_RETRY_MAX_SECONDS)
+
+
+def run_batch(jobs):
+    """Выполняет захваченные задачи по очереди.
+
+    Выполненные удаляются одним DELETE в конце пачки, если захват ещё
+    у этого воркера, поэтому задачи упавшего или опоздавшего воркера
+    могут выполниться ещё раз: их функции должны переносить повтор.
+    Возвращает пару (выполнено, неудачно).
+    """
+    done = []
+    failed = 0
+    for job in jobs:
+        try:
+            func = registry.get(job.name)
+            if func is None:
+                raise LookupError('Задача не зарегистрирована: %s' % job.name)
+            if job.attempts > job.max_attempts:
+                raise TimeoutError('Захват истёк после последней попытки')
+            payload = json.loads(job.payload)
+            func(*payload.get('args', ()), **payload.get('kwargs', {}))
+        except Exception as error:
+            fail(job, error)
+            failed += 1
+        else:
+            done.append(job.pk)
+    if done:
+        # Задачи, захват которых истёк и перешёл к другому воркеру,
+        # удалит он сам
+        Job.objects.filter(pk__in=done, claim=jobs[0].claim).delete()
+    return len(done), failed
+
+
+def fail(job, error):
+    gave_up = job.attempts >= job.max_attempts
+    Job.objects.filter(pk=job.pk, claim=job.claim).update(
+        status=Job.FAILED if gave_up else Job.QUEUED,
+        claim='', last_error=repr(error)[:1000],
+        run_at=timezone.now() + timedelta(seconds=retry_delay(job.attempts)))
+
+
+def work(batch_size, lease_seconds, interval, once=False,
+         stopping=lambda: False, on_batch=None):
+    """Цикл воркера: захватить пачку, выполнить, повторить.
+
+    Когда очередь пуста, ждёт interval секунд, а с once -- выходит.
+    on_batch(выполнено, неудачно) вызывается после каждой пачки.
+    Возвращает пару (выполнено, неудачно) за всё время.
+    """
+    total_done = total_failed = 0
+    while not stopping():
+        jobs = claim_batch(batch_size, lease_seconds)
+        if not jobs:
+            if once:
+                break
+            time.sleep(interval)
+            continue
+        done, failed = run_batch(jobs)
+        total_done += done
+        total_failed += failed
+        if on_batch is not None:
+            on_batch(done, failed)
+    return total_done, total_failed
@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalCache:
+    """Кэш в памяти процесса перед общим кэшем: без сети.
+
+    Значения хранятся как есть, без копирования: изменяемые объекты
+    кладут в pickle, чтобы запросы не меняли общую копию. Записи живут
+    timeout секунд -- столько другой воркер может видеть устаревшее
+    значение после изменения; хранится не больше max_entries последних
+    записей.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        if not timeout:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,143 @@
+import pickle
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Складывает письма в таблицу OutgoingEmail и сразу возвращает
+    управление; доставляет их команда send_queued_mail через
+    EMAIL_QUEUE_BACKEND."""
+
+    def send_messages(self, email_messages):
+        rows = []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            message.connection = None
+            rows.append(OutgoingEmail(
+                message=pickle.dumps(message),
+                subject=message.subject[:255],
+                recipients=', '.join(message.recipients()),
+            ))
+        OutgoingEmail.objects.bulk_create(rows)
+        return len(rows)
+
+
+def claim_batch(size, lease_seconds):
+    """Захватывает до size писем, которые пора отправить.
+
+    Захват -- UPDATE с уникальной меткой, так что несколько воркеров
+    не получат одно письмо; письма воркера, упавшего посреди отправки,
+    снова становятся доступны через lease_seconds. Попытка считается
+    при захвате: письмо, на котором воркер падает, не повторяется
+    бесконечно.
+    """
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(
+        status__in=(OutgoingEmail.QUEUED, OutgoingEmail.SENDING),
+        next_attempt_at__lte=now,
+    ).order_by('next_attempt_at')
+    ids = list(due.values_list('id', flat=True)[:size])
+    if not ids:
+        return []
+    claim = uuid.uuid4().hex
+    due.filter(id__in=ids).update(
+        status=OutgoingEmail.SENDING, claim=claim,
+        attempts=F('attempts') + 1,
+        next_attempt_at=now + timedelta(seconds=lease_seconds))
+    return list(OutgoingEmail.objects.filter(claim=claim).order_by('id'))
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка: base, 2*base, 4*base... до максимума."""
+    return min(
+        settings.EMAIL_QUEUE_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.EMAIL_QUEUE_RETRY_MAX_SECONDS)
+
+
+def deliver(emails):
+    """Отправляет письма через одно соединение EMAIL_QUEUE_BACKEND.
+
+    Результат записывается, только если захват ещё у этого воркера:
+    письмо, захват которого истёк и перешёл к другому, обновит он сам.
+    Возвращает пару (отправлено, неудачно).
+    """
+    sent = failed = 0
+    connection = get_connection(settings.EMAIL_QUEUE_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            fail(email, error)
+        return 0, len(emails)
+    try:
+        for email in emails:
+            try:
+                if email.attempts > settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+                    raise TimeoutError('Захват истёк после последней попытки')
+                message = pickle.loads(email.message)
+                message.connection = connection
+                connection.send_messages([message])
+            except Exception as error:
+                fail(email, error)
+                failed += 1
+            else:
+                OutgoingEmail.objects.filter(
+                    pk=email.pk, claim=email.claim,
+                ).update(
+                    status=OutgoingEmail.SENT, sent_at=timezone.now(),
+                    claim='', last_error='')
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def fail(email, error):
+    gave_up = email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS
+    OutgoingEmail.objects.filter(pk=email.pk, claim=email.claim).update(
+        status=OutgoingEmail.FAILED if gave_up else OutgoingEmail.QUEUED,
+        claim='', last_error=repr(error)[:1000],
+        next_attempt_at=timezone.now() + timedelta(
+            seconds=retry_delay(email.attempts)))
+
+
+def queue_stats(window=timedelta(hours=1)):
+    """Глубина очереди и задержка доставки за последнее окно."""
+    now = timezone.now()
+    waiting = OutgoingEmail.objects.filter(
+        status__in=(OutgoingEmail.QUEUED, OutgoingEmail.SENDING))
+    oldest = waiting.aggregate(oldest=Min('created_at'))['oldest']
+    latencies = sorted(
+        (sent_at - created_at).total_seconds()
+        for created_at, sent_at in OutgoingEmail.objects.filter(
+            sent_at__gte=now - window).values_list('created_at', 'sent_at'))
+
+    def percentile(percent):
+        if not latencies:
+            return None
+        return latencies[min(
+            len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+    return {
+        'queued': waiting.count(),
+        # Захваченное письмо уже посчитало текущую попытку
+        'retrying': waiting.filter(
+            Q(status=OutgoingEmail.QUEUED, attempts__gt=0)
+            | Q(status=OutgoingEmail.SENDING, attempts__gt=1)).count(),
+        'failed': OutgoingEmail.objects.filter(
+            status=OutgoingEmail.FAILED).count(),
+        'oldest_seconds': (
+            (now - oldest).total_seconds() if oldest else None),
+        'sent': len(latencies),
+        'latency_p50': percentile(50),
+        'latency_p95': percentile(95),
+    }
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.mail import queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Глубина очереди писем и задержка доставки за последний час.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Вывести одной строкой JSON для мониторинга.',
+        )
+
+    def handle(self, *args, **options):
+        stats = queue_stats()
+        if options['json']:
+            self.stdout.write(json.dumps(stats))
+            return
+        self.stdout.write('В очереди: %s (повторных: %s)' % (
+            stats['queued'], stats['retrying']))
+        self.stdout.write('Не доставлено: %s' % stats['failed'])
+        if stats['oldest_seconds'] is not None:
+            self.stdout.write(
+                'Самое старое ждёт: %.0f c' % stats['oldest_seconds'])
+        self.stdout.write('Отправлено за час: %s' % stats['sent'])
+        if stats['sent']:
+            self.stdout.write('Задержка доставки: p50 %.1f c, p95 %.1f c' % (
+                stats['latency_p50'], stats['latency_p95']))
@@ -0,0 +1,78 @@
+import glob
+import json
+import os
+import pstats
+from collections import defaultdict
+from io import StringIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.middleware.profiling import ALLOCATIONS_SUFFIX, PROFILE_SUFFIX
+
+
+class Command(BaseCommand):
+    help = ('Сводка по дампам ProfilingMiddleware: самые дорогие функции '
+            'и места выделения памяти.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            default=settings.PROFILING_DIR,
+            help='Каталог с дампами; по умолчанию PROFILING_DIR.',
+        )
+        parser.add_argument(
+            '--path',
+            default='',
+            help='Учитывать только запросы, адрес которых содержит строку.',
+        )
+        parser.add_argument(
+            '--sort',
+            default='cumulative',
+            choices=('cumulative', 'tottime', 'ncalls'),
+        )
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument(
+            '--match',
+            help='Показывать только функции, путь или имя которых '
+                 'совпадает с регулярным выражением.',
+        )
+
+    def handle(self, *args, **options):
+        names = []
+        for path in sorted(glob.glob(
+                os.path.join(options['dir'], '*' + ALLOCATIONS_SUFFIX))):
+            name = path[:-len(ALLOCATIONS_SUFFIX)]
+            if not os.path.exists(name + PROFILE_SUFFIX):
+                continue
+            with open(path) as source:
+                dump = json.load(source)
+            if options['path'] in dump['path']:
+                names.append((name, dump))
+        if not names:
+            raise CommandError('Дампов не найдено')
+
+        elapsed = sorted(dump['elapsed_ms'] for _, dump in names)
+        self.stdout.write(
+            'Запросов: %s, медиана %.1f мс, максимум %.1f мс' % (
+                len(names), elapsed[len(elapsed) // 2], elapsed[-1]))
+
+        report = StringIO()
+        stats = pstats.Stats(
+            *(name + PROFILE_SUFFIX for name, _ in names), stream=report)
+        restrictions = [options['limit']]
+        if options['match']:
+            restrictions.insert(0, options['match'])
+        stats.sort_stats(options['sort']).print_stats(*restrictions)
+        self.stdout.write(report.getvalue())
+
+        allocations = defaultdict(lambda: [0, 0])
+        for _, dump in names:
+            for row in dump['allocations']:
+                allocations[row['trace']][0] += row['size']
+                allocations[row['trace']][1] += row['count']
+        self.stdout.write('Память (суммарно по запросам):')
+        top = sorted(allocations.items(), key=lambda item: -item[1][0])
+        for trace, (size, count) in top[:options['limit']]:
+            self.stdout.write('%10.1f KiB %8s  %s' % (
+                size / 1024, count, trace))
@@ -0,0 +1,152 @@
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import discover, work
+
+# Пауза перед перезапуском упавшего воркера: удваивается, пока воркеры
+# падают вскоре после запуска, и сбрасывается, если воркер проработал
+# RESPAWN_RESET_SECONDS
+RESPAWN_BASE_SECONDS = 1
+RESPAWN_MAX_SECONDS = 60
+RESPAWN_RESET_SECONDS = 60
+
+
+def respawn_delay(crashes):
+    return min(
+        RESPAWN_BASE_SECONDS * 2 ** (crashes - 1), RESPAWN_MAX_SECONDS)
+
+
+def run_worker(options, done, failed):
+    """Тело процесса-воркера: по SIGTERM или SIGINT доделывает текущую
+    пачку и выходит."""
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    def on_batch(batch_done, batch_failed):
+        with done.get_lock():
+            done.value += batch_done
+        with failed.get_lock():
+            failed.value += batch_failed
+
+    work(
+        options['batch_size'], options['lease'], options['interval'],
+        once=options['once'], stopping=lambda: bool(stopping),
+        on_batch=on_batch)
+
+
+class Command(BaseCommand):
+    help = ('Запускает пул процессов, которые выполняют фоновые задачи '
+            'из очереди core.models.Job.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.JOBS_WORKERS,
+            help='Число процессов; 0 -- выполнять задачи в этом процессе.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.JOBS_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--lease',
+            type=float,
+            default=settings.JOBS_LEASE_SECONDS,
+            help='Через сколько секунд задачи упавшего воркера снова '
+                 'в очереди.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.JOBS_POLL_SECONDS,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать очередь и выйти.',
+        )
+
+    def handle(self, *args, **options):
+        discover()
+        if not options['workers']:
+            done, failed = work(
+                options['batch_size'], options['lease'],
+                options['interval'], once=options['once'])
+            self.report(done, failed)
+            return
+        self.report(*self.run_pool(options))
+
+    def run_pool(self, options):
+        """Держит options['workers'] процессов, перезапуская упавшие,
+        пока не придёт сигнал остановки или, с --once, не опустеет
+        очередь. Возвращает пару (выполнено, неудачно)."""
+        # Процессы получают копию реестра задач и настроек через fork;
+        # открытые соединения с базой им передавать нельзя
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        done, failed = context.Value('l', 0), context.Value('l', 0)
+        stopping = []
+        started = {}
+        crashes = 0
+
+        def start():
+            process = context.Process(
+                target=run_worker, args=(options, done, failed))
+            process.start()
+            started[process] = time.monotonic()
+            return process
+
+        processes = [start() for _ in range(options['workers'])]
+
+        def stop(signum, frame):
+            stopping.append(signum)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        while processes:
+            wait([process.sentinel for process in processes])
+            for process in [p for p in processes if not p.is_alive()]:
+                processes.remove(process)
+                process.join()
+                lifetime = time.monotonic() - started.pop(process)
+                if not process.exitcode or stopping:
+                    continue
+                if lifetime >= RESPAWN_RESET_SECONDS:
+                    crashes = 0
+                crashes += 1
+                delay = respawn_delay(crashes)
+                self.stderr.write(
+                    'Воркер %s завершился с кодом %s, перезапуск через '
+                    '%s c' % (process.pid, process.exitcode, delay))
+                self.pause(delay, stopping)
+                if not stopping:
+                    processes.append(start())
+        return done.value, failed.value
+
+    def pause(self, seconds, stopping):
+        """Спит seconds секунд, но просыпается по сигналу остановки."""
+        deadline = time.monotonic() + seconds
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(min(0.1, deadline - time.monotonic()))
+
+    def report(self, done, failed):
+        self.stdout.write(self.style.SUCCESS(
+            'Выполнено задач: %s, ошибок: %s' % (done, failed)))
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.mail import claim_batch, deliver
+
+
+class Command(BaseCommand):
+    help = ('Доставляет письма из очереди QueuedEmailBackend пачками '
+            'через одно соединение, с повторами и растущей задержкой.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать очередь и выйти.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_QUEUE_POLL_SECONDS,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            emails = claim_batch(
+                options['batch_size'], settings.EMAIL_QUEUE_LEASE_SECONDS)
+            if emails:
+                sent, failed = deliver(emails)
+                total_sent += sent
+                total_failed += failed
+                if options['verbosity'] > 1:
+                    self.stdout.write(
+                        'Отправлено: %s, ошибок: %s' % (sent, failed))
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            'Отправлено писем: %s, ошибок: %s' % (total_sent, total_failed)))
@@ -0,0 +1,105 @@
+import cProfile
+import json
+import os
+import random
+import re
+import threading
+import time
+import tracemalloc
+
+from django.conf import settings
+
+PROFILE_SUFFIX = '.prof'
+ALLOCATIONS_SUFFIX = '.alloc.json'
+
+# cProfile и tracemalloc профилируют один запрос за раз
+_lock = threading.Lock()
+
+
+def dump_name(request, elapsed_ms):
+    path = re.sub(r'[^\w-]+', '_', request.path).strip('_') or 'root'
+    return '%s-%s-%s-%dms' % (
+        time.strftime('%Y%m%d%H%M%S'), request.method, path[:60],
+        elapsed_ms)
+
+
+def rotate(directory, max_bytes):
+    """Удаляет самые старые дампы, пока каталог больше max_bytes."""
+    files = [
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith((PROFILE_SUFFIX, ALLOCATIONS_SUFFIX))
+    ]
+    files.sort(key=os.path.getmtime)
+    total = sum(os.path.getsize(path) for path in files)
+    while files and total > max_bytes:
+        path = files.pop(0)
+        total -= os.path.getsize(path)
+        os.remove(path)
+
+
+class ProfilingMiddleware:
+    """Профилирует долю запросов cProfile и tracemalloc.
+
+    Включается PROFILING_ENABLED; профилируется PROFILING_SAMPLE_RATE
+    запросов. Дамп .prof и топ PROFILING_TOP_ALLOCATIONS мест выделения
+    памяти сохраняются в PROFILING_DIR, только если запрос шёл не меньше
+    PROFILING_THRESHOLD_MS; каталог не растёт больше PROFILING_MAX_BYTES.
+    Сводку строит команда profile_report.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (not settings.PROFILING_ENABLED
+                or random.random() >= settings.PROFILING_SAMPLE_RATE
+                or not _lock.acquire(blocking=False)):
+            return self.get_response(request)
+        try:
+            return self.profile(request)
+        finally:
+            _lock.release()
+
+    def profile(self, request):
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            snapshot = tracemalloc.take_snapshot()
+            if not tracing:
+                tracemalloc.stop()
+        if elapsed_ms >= settings.PROFILING_THRESHOLD_MS:
+            self.save(request, elapsed_ms, profiler, snapshot)
+        return response
+
+    def save(self, request, elapsed_ms, profiler, snapshot):
+        directory = settings.PROFILING_DIR
+        os.makedirs(directory, exist_ok=True)
+        name = os.path.join(directory, dump_name(request, elapsed_ms))
+        profiler.dump_stats(name + PROFILE_SUFFIX)
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        ))
+        allocations = [{
+            'trace': '%s:%s' % (stat.traceback[0].filename,
+                                stat.traceback[0].lineno),
+            'size': stat.size,
+            'count': stat.count,
+        } for stat in snapshot.statistics('lineno')[
+            :settings.PROFILING_TOP_ALLOCATIONS]]
+        with open(name + ALLOCATIONS_SUFFIX, 'w') as target:
+            json.dump({
+                'method': request.method,
+                'path': request.get_full_path(),
+                'elapsed_ms': round(elapsed_ms, 2),
+                'allocations': allocations,
+            }, target, ensure_ascii=False)
+        rotate(directory, settings.PROFILING_MAX_BYTES)
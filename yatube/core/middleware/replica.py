@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.http import SAFE_METHODS
+from core.routers import pin_primary, reset_state, track_writes, wrote
+
+
+class ReplicaPinMiddleware:
+    """Читай свои записи: после записи клиент REPLICA_PIN_SECONDS читает
+    из основной базы, пока реплики догоняют её.
+
+    Закрепление хранится в cookie REPLICA_PIN_COOKIE, поэтому работает
+    и для анонимных запросов (регистрация). Небезопасные методы всегда
+    читают из основной базы.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reset_state()
+        pin_primary(
+            request.method not in SAFE_METHODS
+            or settings.REPLICA_PIN_COOKIE in request.COOKIES)
+        try:
+            with connections[DEFAULT_DB_ALIAS].execute_wrapper(
+                    track_writes):
+                response = self.get_response(request)
+            if wrote():
+                response.set_cookie(
+                    settings.REPLICA_PIN_COOKIE, '1',
+                    max_age=settings.REPLICA_PIN_SECONDS, httponly=True,
+                    samesite='Lax')
+        finally:
+            reset_state()
+        return response
@@ -0,0 +1,140 @@
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_original_render = Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    """Считает время внешних рендерингов; шаблоны виджетов форм
+    рендерятся внутри шаблона страницы и второй раз не учитываются."""
+    stats = getattr(_local, 'stats', None)
+    if stats is None or stats.rendering:
+        return _original_render(self, context, request)
+    stats.rendering = True
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        stats.rendering = False
+        stats.template_ms += (time.perf_counter() - started) * 1000
+
+
+def install_template_timing():
+    """Подменяет Template.render замером времени; только когда
+    SQL_TIMING_ENABLED, чтобы без него рендеринг шёл как обычно."""
+    if Template.render is not _timed_render:
+        Template.render = _timed_render
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = []
+        self.template_ms = 0.0
+        self.rendering = False
+
+    @property
+    def sql_ms(self):
+        return sum(query['ms'] for query in self.queries)
+
+    def slowest(self, count):
+        return sorted(
+            self.queries, key=lambda query: query['ms'], reverse=True
+        )[:count]
+
+    def record(self, alias):
+        def wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append({
+                    'alias': alias,
+                    'sql': sql,
+                    'params': None if many else params,
+                    'ms': (time.perf_counter() - started) * 1000,
+                })
+        return wrapper
+
+
+def explain(query):
+    """План запроса или None, если его не построить."""
+    sql = query['sql'].lstrip().upper()
+    if query['params'] is None or not sql.startswith('SELECT'):
+        return None
+    connection = connections[query['alias']]
+    prefix = connection.ops.explain_query_prefix()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('%s %s' % (prefix, query['sql']), query['params'])
+            return [' '.join(str(value) for value in row)
+                    for row in cursor.fetchall()]
+    except Exception:
+        logger.debug('Не удалось получить EXPLAIN', exc_info=True)
+        return None
+
+
+class SqlTimingMiddleware:
+    """Число и время SQL-запросов и время рендеринга шаблона.
+
+    Включается SQL_TIMING_ENABLED. Итоги уходят в заголовок
+    Server-Timing; если запросы заняли не меньше
+    SQL_TIMING_THRESHOLD_MS, в лог пишется строка JSON с самыми
+    медленными запросами и их планами.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SQL_TIMING_ENABLED:
+            return self.get_response(request)
+        install_template_timing()
+        stats = _local.stats = RequestStats()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(
+                        stats.record(connection.alias)))
+                response = self.get_response(request)
+        finally:
+            _local.stats = None
+        total_ms = (time.perf_counter() - started) * 1000
+
+        response['Server-Timing'] = ', '.join((
+            'sql;dur=%.1f;desc="%s queries"' % (
+                stats.sql_ms, len(stats.queries)),
+            'tpl;dur=%.1f' % stats.template_ms,
+            'total;dur=%.1f' % total_ms,
+        ))
+        threshold = settings.SQL_TIMING_THRESHOLD_MS
+        if stats.queries and stats.sql_ms >= threshold:
+            self.log(request, response, stats, total_ms)
+        return response
+
+    def log(self, request, response, stats, total_ms):
+        slowest = [{
+            'sql': query['sql'],
+            'ms': round(query['ms'], 2),
+            'explain': explain(query),
+        } for query in stats.slowest(settings.SQL_TIMING_SLOWEST)]
+        logger.warning(json.dumps({
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'sql_ms': round(stats.sql_ms, 2),
+            'queries': len(stats.queries),
+            'template_ms': round(stats.template_ms, 2),
+            'slowest': slowest,
+        }, ensure_ascii=False, default=str))
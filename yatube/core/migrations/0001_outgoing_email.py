@@ -0,0 +1,74 @@
+# Generated by Django 2.2.16 on 2026-10-17 02:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID')),
+                ('message', models.BinaryField(
+                    verbose_name='Письмо (pickle)')),
+                ('subject', models.CharField(
+                    max_length=255, verbose_name='Тема')),
+                ('recipients', models.TextField(
+                    verbose_name='Получатели')),
+                ('status', models.CharField(
+                    choices=[
+                        ('queued', 'В очереди'),
+                        ('sending', 'Отправляется'),
+                        ('sent', 'Отправлено'),
+                        ('failed', 'Не доставлено'),
+                    ],
+                    default='queued',
+                    max_length=10,
+                    verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(
+                    default=0, verbose_name='Попыток')),
+                ('next_attempt_at', models.DateTimeField(
+                    default=django.utils.timezone.now,
+                    verbose_name='Следующая попытка')),
+                ('claim', models.CharField(blank=True, max_length=32)),
+                ('last_error', models.TextField(
+                    blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(
+                    default=django.utils.timezone.now,
+                    verbose_name='Поставлено в очередь')),
+                ('sent_at', models.DateTimeField(
+                    blank=True, null=True, verbose_name='Отправлено')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outgoing_email_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(
+                fields=['claim'], name='outgoing_email_claim_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(
+                fields=['sent_at'], name='outgoing_email_sent_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 2.2.16 on 2026-10-17 02:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID')),
+                ('name', models.CharField(
+                    max_length=200, verbose_name='Задача')),
+                ('payload', models.TextField(
+                    default='{}', verbose_name='Аргументы')),
+                ('priority', models.SmallIntegerField(
+                    default=0,
+                    help_text='Задачи с большим приоритетом '
+                              'выполняются раньше',
+                    verbose_name='Приоритет')),
+                ('status', models.CharField(
+                    choices=[
+                        ('queued', 'В очереди'),
+                        ('running', 'Выполняется'),
+                        ('failed', 'Не выполнена'),
+                    ],
+                    default='queued',
+                    max_length=10,
+                    verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(
+                    default=0, verbose_name='Попыток')),
+                ('max_attempts', models.PositiveSmallIntegerField(
+                    default=5, verbose_name='Наибольшее число попыток')),
+                ('run_at', models.DateTimeField(
+                    default=django.utils.timezone.now,
+                    verbose_name='Запуск не раньше')),
+                ('claim', models.CharField(blank=True, max_length=32)),
+                ('last_error', models.TextField(
+                    blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(
+                    default=django.utils.timezone.now,
+                    verbose_name='Поставлена в очередь')),
+            ],
+            options={
+                'verbose_name': 'Фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(
+                fields=['status', '-priority', 'run_at'],
+                name='job_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['claim'], name='job_claim_idx'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди QueuedEmailBackend до доставки воркером."""
+    QUEUED = 'queued'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не доставлено'),
+    )
+
+    message = models.BinaryField(verbose_name='Письмо (pickle)')
+    subject = models.CharField(verbose_name='Тема', max_length=255)
+    recipients = models.TextField(verbose_name='Получатели')
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток', default=0)
+    # Для письма в очереди -- время следующей попытки, для письма
+    # у воркера -- когда истекает его захват
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка', default=timezone.now)
+    claim = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(verbose_name='Ошибка', blank=True)
+    created_at = models.DateTimeField(
+        verbose_name='Поставлено в очередь', default=timezone.now)
+    sent_at = models.DateTimeField(
+        verbose_name='Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outgoing_email_due_idx'),
+            models.Index(
+                fields=['claim'], name='outgoing_email_claim_idx'),
+            models.Index(
+                fields=['sent_at'], name='outgoing_email_sent_idx'),
+        ]
+
+    def __str__(self):
+        return '%s: %s' % (self.recipients, self.subject)
+
+
+class Job(models.Model):
+    """Фоновая задача: функция из реестра core.jobs и её аргументы."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Не выполнена'),
+    )
+
+    name = models.CharField(verbose_name='Задача', max_length=200)
+    # JSON: {"args": [...], "kwargs": {...}}
+    payload = models.TextField(verbose_name='Аргументы', default='{}')
+    priority = models.SmallIntegerField(
+        verbose_name='Приоритет',
+        default=0,
+        help_text='Задачи с большим приоритетом выполняются раньше',
+    )
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Наибольшее число попыток', default=5)
+    # Для задачи в очереди -- не раньше какого времени её запускать,
+    # для задачи у воркера -- когда истекает её захват
+    run_at = models.DateTimeField(
+        verbose_name='Запуск не раньше', default=timezone.now)
+    claim = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(verbose_name='Ошибка', blank=True)
+    created_at = models.DateTimeField(
+        verbose_name='Поставлена в очередь', default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            models.Index(
+                fields=['status', '-priority', 'run_at'],
+                name='job_due_idx'),
+            models.Index(fields=['claim'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return '%s: %s' % (self.pk, self.name)
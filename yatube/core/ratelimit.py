@@ -0,0 +1,146 @@
+import math
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+from .http import SAFE_METHODS
+from .local_cache import LocalCache
+
+
+def take_token(state, capacity, period, now):
+    """Маркерное ведро: capacity маркеров, полностью наполняется
+    за period секунд.
+
+    state -- (маркеров, время) или None для полного ведра. Возвращает
+    (разрешено, новое состояние, через сколько секунд появится маркер).
+    """
+    rate = capacity / period
+    tokens = capacity
+    if state is not None:
+        tokens = min(capacity, state[0] + (now - state[1]) * rate)
+    if tokens >= 1:
+        return True, (tokens - 1, now), 0
+    return False, state, (1 - tokens) / rate
+
+
+def refund_token(state, capacity, period, now):
+    """Возвращает в ведро маркер запроса, который ничего не записал."""
+    if state is None:
+        return None
+    tokens = state[0] + (now - state[1]) * capacity / period
+    return min(capacity, tokens + 1), now
+
+
+class LocalBackend:
+    """Вёдра в памяти процесса: без сети, но у каждого воркера свои,
+    так что клиент получает limit на каждый процесс."""
+
+    def __init__(self, max_entries=10000):
+        self.buckets = LocalCache(max_entries)
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        with self.lock:
+            allowed, state, retry_after = take_token(
+                self.buckets.get(key), capacity, period, time.time())
+            if allowed:
+                self.buckets.set(key, state, period)
+        return allowed, retry_after
+
+    def refund(self, key, capacity, period):
+        with self.lock:
+            state = self.buckets.get(key)
+            if state is not None:
+                self.buckets.set(key, refund_token(
+                    state, capacity, period, time.time()), period)
+
+
+class CacheBackend:
+    """Вёдра в общем кэше (CACHES['default']) -- один лимит на все
+    процессы.
+
+    Чтение и запись ведра не атомарны: одновременные запросы одного
+    клиента из разных процессов могут пройти сверх лимита на число
+    процессов, что для защиты от потока записей не важно.
+    """
+
+    def take(self, key, capacity, period):
+        allowed, state, retry_after = take_token(
+            cache.get(key), capacity, period, time.time())
+        if allowed:
+            cache.set(key, state, period)
+        return allowed, retry_after
+
+    def refund(self, key, capacity, period):
+        state = cache.get(key)
+        if state is not None:
+            cache.set(
+                key, refund_token(state, capacity, period, time.time()),
+                period)
+
+
+backends = {}
+
+
+def get_backend():
+    path = settings.RATELIMIT_BACKEND
+    if path not in backends:
+        backends[path] = import_string(path)()
+    return backends[path]
+
+
+def client_ip(request):
+    """IP клиента: из RATELIMIT_CLIENT_IP_HEADER, если он задан
+    и пришёл, иначе REMOTE_ADDR.
+
+    Из списка через запятую (X-Forwarded-For) берётся последний адрес:
+    его дописал свой прокси, а начало списка присылает сам клиент.
+    """
+    header = settings.RATELIMIT_CLIENT_IP_HEADER
+    if header and request.META.get(header):
+        return request.META[header].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR')
+
+
+def bucket_key(name, request):
+    """Ведро пользователя, а для анонимного запроса -- его IP."""
+    if request.user.is_authenticated:
+        return 'ratelimit:%s:user:%s' % (name, request.user.pk)
+    return 'ratelimit:%s:ip:%s' % (name, client_ip(request))
+
+
+def ratelimit(name):
+    """Ограничивает частоту изменяющих запросов к view.
+
+    Лимит -- RATELIMITS[name] = (запросов, за секунд). Запрос сверх
+    лимита получает 429 с Retry-After до формы и запросов к базе;
+    безопасные методы (GET, HEAD...) не ограничиваются. Если view
+    ответила 200 -- показала форму с ошибками, ничего не записав, --
+    маркер возвращается в ведро.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limit = settings.RATELIMITS.get(name)
+            if limit is None or request.method in SAFE_METHODS:
+                return view(request, *args, **kwargs)
+            backend = get_backend()
+            key = bucket_key(name, request)
+            allowed, retry_after = backend.take(key, *limit)
+            if not allowed:
+                response = HttpResponse(
+                    'Слишком много запросов, попробуйте позже.',
+                    content_type='text/plain; charset=utf-8', status=429)
+                response['Retry-After'] = math.ceil(retry_after)
+                return response
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                backend.refund(key, *limit)
+            return response
+        return wrapper
+    return decorator
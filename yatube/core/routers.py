@@ -0,0 +1,55 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = threading.local()
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def pin_primary(pinned=True):
+    """Направляет чтения текущего потока в основную базу."""
+    _state.pinned = pinned
+
+
+def reset_state():
+    _state.pinned = False
+    _state.wrote = False
+
+
+def wrote():
+    """Была ли в текущем запросе запись в основную базу."""
+    return getattr(_state, 'wrote', False)
+
+
+def track_writes(execute, sql, params, many, context):
+    """execute_wrapper основной базы: отмечает запросы, которые что-то
+    пишут. db_for_write для этого не годится -- его вызывают и чтобы
+    просто выбрать базу (get_or_create, db_manager)."""
+    if sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+        _state.wrote = True
+    return execute(sql, params, many, context)
+
+
+class ReplicaRouter:
+    """Чтение -- из реплик DATABASE_REPLICAS, запись -- в основную базу.
+
+    Чтения остаются в основной базе, если поток закреплён за ней
+    (pin_primary) или идёт транзакция: внутри неё нужно видеть
+    собственные изменения.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (not replicas or getattr(_state, 'pinned', False)
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики -- копии основной базы
+        return True
@@ -0,0 +1,46 @@
+import pickle
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+from .local_cache import LocalCache
+
+local_sessions = LocalCache()
+
+
+class SessionStore(cached_db.SessionStore):
+    """cached_db с ещё одним уровнем кэша в памяти процесса.
+
+    Чтение: память процесса, общий кэш, база. Запись и удаление идут
+    во все три уровня сразу. Сессия сохраняется, только если изменилась
+    (SESSION_SAVE_EVERY_REQUEST выключен), так что обычный просмотр
+    страницы не обращается к базе.
+
+    В памяти процесса сессия лежит в pickle, чтобы запросы не делили
+    вложенные списки и словари.
+    """
+
+    def load(self):
+        pickled = local_sessions.get(self.cache_key)
+        if pickled is not None:
+            return pickle.loads(pickled)
+        data = super().load()
+        if self.session_key is not None:
+            local_sessions.set(
+                self.cache_key, pickle.dumps(data),
+                settings.LOCAL_CACHE_SECONDS)
+        return data
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        local_sessions.set(
+            self.cache_key,
+            pickle.dumps(self._get_session(no_load=must_create)),
+            settings.LOCAL_CACHE_SECONDS)
+
+    def delete(self, session_key=None):
+        if session_key is None and self.session_key is None:
+            return
+        local_sessions.delete(
+            self.cache_key_prefix + (session_key or self.session_key))
+        super().delete(session_key)
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth import cache_user, forget_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_cached_user(sender, instance, **kwargs):
+    cache_user(instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def drop_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
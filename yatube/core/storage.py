@@ -0,0 +1,61 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Что сжимать: картинки PNG/JPEG/ICO уже сжаты или почти не сжимаются
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.map', '.json')
+# Какие сжатые копии писать, в порядке предпочтения при отдаче;
+# br -- только если установлен brotli
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+def compress(content, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    return brotli.compress(content)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Файлы с хэшем содержимого в имени и рядом их сжатые копии
+    .gz и .br (если они меньше оригинала).
+
+    Пока collectstatic не запускался, {% static %} отдаёт имена без
+    хэша, чтобы отладка и тесты работали без сборки.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.write_compressed(hashed_name)
+
+    def write_compressed(self, name):
+        with self.open(name) as source:
+            content = source.read()
+        for encoding, suffix in ENCODINGS.items():
+            if encoding == 'br' and brotli is None:
+                continue
+            compressed = compress(content, encoding)
+            if len(compressed) >= len(content):
+                continue
+            with open(self.path(name + suffix), 'wb') as target:
+                target.write(compressed)
@@ -0,0 +1,15 @@
+from django import template
+
+from yatube.utils import PAGE_ELLIPSIS, elided_page_range
+
+register = template.Library()
+
+
+@register.filter
+def page_window(page_obj):
+    return elided_page_range(page_obj)
+
+
+@register.filter
+def is_ellipsis(value):
+    return value == PAGE_ELLIPSIS
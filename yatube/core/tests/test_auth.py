@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.auth import local_users
+from core.sessions import SessionStore, local_sessions
+from posts.models import User
+
+
+class CachedSessionAuthTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='TestUser', password='old-password-123')
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        local_sessions.clear()
+        self.authorized_client = Client()
+        self.authorized_client.login(
+            username='TestUser', password='old-password-123')
+        self.url = reverse('about:author')
+
+    def test_page_view_without_queries(self):
+        """Повторный просмотр страницы не обращается к базе."""
+        self.authorized_client.get(self.url)
+        for level in ('local', 'shared'):
+            with self.subTest(level=level):
+                if level == 'shared':
+                    local_users.clear()
+                    local_sessions.clear()
+                with self.assertNumQueries(0):
+                    response = self.authorized_client.get(self.url)
+                self.assertEqual(response.context['user'], self.user)
+
+    def test_password_change_logs_out_other_sessions(self):
+        """Смена пароля сразу видна через кэш: другие сессии выходят."""
+        self.authorized_client.get(self.url)
+        other_client = Client()
+        other_client.login(username='TestUser', password='old-password-123')
+        response = self.authorized_client.post(
+            reverse('users:pswrd_change'), {
+                'old_password': 'old-password-123',
+                'new_password1': 'new-password-456',
+                'new_password2': 'new-password-456',
+            })
+        self.assertEqual(response.status_code, 302)
+        response = self.authorized_client.get(self.url)
+        self.assertTrue(response.context['user'].is_authenticated)
+        response = other_client.get(self.url)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_logout_drops_cached_session(self):
+        """После выхода старая cookie сессии не работает."""
+        cookie = self.authorized_client.cookies[settings.SESSION_COOKIE_NAME]
+        self.authorized_client.get(self.url)
+        self.authorized_client.get(reverse('users:logout'))
+        stale_client = Client()
+        stale_client.cookies[settings.SESSION_COOKIE_NAME] = cookie.value
+        response = stale_client.get(self.url)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_session_of_model_backend_still_valid(self):
+        """Сессии, созданные с ModelBackend до кэширования, не теряются."""
+        client = Client()
+        client.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend')
+        response = client.get(self.url)
+        self.assertTrue(response.context['user'].is_authenticated)
+
+    def test_cached_session_not_shared(self):
+        """Запросы получают свои копии вложенных значений сессии."""
+        session = SessionStore()
+        session['recent'] = {'posts': [1]}
+        session.save()
+        SessionStore(session.session_key)['recent']['posts'].append(2)
+        self.assertEqual(
+            SessionStore(session.session_key)['recent'], {'posts': [1]})
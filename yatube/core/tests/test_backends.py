@@ -0,0 +1,30 @@
+from django.db import connection
+from django.test import TestCase
+
+from core.backends.sqlite3.base import DEFAULT_PRAGMAS
+
+
+class SqliteBackendTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA %s' % name)
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied(self):
+        """Каждое соединение получает PRAGMA из настроек бэкенда."""
+        self.assertEqual(connection.vendor, 'sqlite')
+        expected = {
+            'busy_timeout': DEFAULT_PRAGMAS['busy_timeout'],
+            # NORMAL
+            'synchronous': 1,
+            'cache_size': DEFAULT_PRAGMAS['cache_size'],
+            # MEMORY
+            'temp_store': 2,
+        }
+        for name, value in expected.items():
+            with self.subTest(name=name):
+                self.assertEqual(self.pragma(name), value)
+
+    def test_options_not_passed_to_connect(self):
+        """Ключ pragmas не уходит в sqlite3.connect."""
+        self.assertNotIn('pragmas', connection.get_connection_params())
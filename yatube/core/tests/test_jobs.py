@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.jobs import enqueue, enqueue_many, task, work
+from core.management.commands.run_workers import (RESPAWN_MAX_SECONDS,
+                                                  respawn_delay)
+from core.models import Job
+
+calls = []
+
+
+@task(name='core.tests.record')
+def record(value, suffix=''):
+    calls.append('%s%s' % (value, suffix))
+
+
+@task(name='core.tests.broken')
+def broken():
+    raise ValueError('Сломано')
+
+
+@task(name='core.tests.lose_claim')
+def lose_claim():
+    # Захват истёк, и задачу забрал другой воркер
+    Job.objects.update(claim='other')
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2)
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def work(self, batch_size=10):
+        return work(batch_size, lease_seconds=60, interval=0, once=True)
+
+    def test_enqueue_and_run(self):
+        """Задача выполняется с аргументами и удаляется из очереди."""
+        enqueue(record, args=('a',), kwargs={'suffix': '!'})
+        enqueue('core.tests.record', args=('b',))
+        self.assertEqual(self.work(), (2, 0))
+        self.assertEqual(calls, ['a!', 'b'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_priority(self):
+        """Задачи с большим приоритетом выполняются раньше."""
+        enqueue(record, args=('low',), priority=-1)
+        enqueue(record, args=('normal',))
+        enqueue(record, args=('high',), priority=10)
+        enqueue(record, args=('later',), priority=10, delay=60)
+        self.work(batch_size=1)
+        self.assertEqual(calls, ['high', 'normal', 'low'])
+        self.assertIn('later', Job.objects.get().payload)
+
+    def test_enqueue_many(self):
+        """Пачка задач ставится в очередь одним запросом."""
+        with self.assertNumQueries(1):
+            enqueue_many(record, [[i] for i in range(5)] + [{'value': 5}])
+        self.assertEqual(self.work(batch_size=4), (6, 0))
+        self.assertEqual(sorted(calls), [str(i) for i in range(6)])
+
+    def test_retry_then_fail(self):
+        """Упавшая задача повторяется позже, потом помечается failed."""
+        enqueue(broken)
+        self.assertEqual(self.work(), (0, 1))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('Сломано', job.last_error)
+        self.assertEqual(self.work(), (0, 0))
+        Job.objects.update(run_at=timezone.now())
+        self.work()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertEqual(self.work(), (0, 0))
+
+    def test_expired_claim_is_retaken(self):
+        """Задачу упавшего воркера забирает другой после истечения
+        захвата, а исчерпавшую попытки -- помечает failed."""
+        enqueue(record, args=('a',))
+        enqueue(record, args=('b',))
+        Job.objects.filter(payload__contains='"a"').update(
+            status=Job.RUNNING, claim='dead', attempts=1,
+            run_at=timezone.now())
+        Job.objects.filter(payload__contains='"b"').update(
+            status=Job.RUNNING, claim='dead', attempts=2,
+            run_at=timezone.now())
+        self.assertEqual(self.work(), (1, 1))
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(Job.objects.get().status, Job.FAILED)
+
+    def test_lost_claim_not_deleted(self):
+        """Выполненную задачу с перехваченным захватом не удаляют."""
+        enqueue(lose_claim)
+        self.assertEqual(self.work(batch_size=1), (1, 0))
+        self.assertEqual(Job.objects.get().claim, 'other')
+
+    def test_respawn_delay(self):
+        """Пауза перед перезапуском воркера растёт до предела."""
+        self.assertEqual(respawn_delay(1), 1)
+        self.assertEqual(respawn_delay(3), 4)
+        self.assertEqual(respawn_delay(100), RESPAWN_MAX_SECONDS)
+
+    def test_unknown_task(self):
+        """Незарегистрированная задача не выполняется и ждёт повтора."""
+        enqueue('core.tests.missing')
+        self.assertEqual(self.work(), (0, 1))
+        self.assertIn('не зарегистрирована', Job.objects.get().last_error)
+
+    def test_run_workers_command(self):
+        """run_workers --once без процессов разбирает очередь."""
+        enqueue_many(record, [[i] for i in range(3)])
+        out = StringIO()
+        call_command('run_workers', workers=0, once=True, stdout=out)
+        self.assertIn('Выполнено задач: 3, ошибок: 0', out.getvalue())
@@ -0,0 +1,112 @@
+import json
+from io import StringIO
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from core.mail import claim_batch, deliver
+from core.models import OutgoingEmail
+from posts.models import User
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    EMAIL_QUEUE_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_QUEUE_MAX_ATTEMPTS=2,
+)
+class QueuedEmailTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            'TestUser', 'test@yatube.ru', 'password-123')
+
+    def reset_password(self):
+        response = Client().post(
+            '/auth/password_reset/', {'email': 'test@yatube.ru'})
+        self.assertEqual(response.status_code, 302)
+
+    def send(self):
+        call_command('send_queued_mail', once=True, stdout=StringIO())
+
+    def stats(self):
+        out = StringIO()
+        call_command('email_queue_stats', json=True, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_password_reset_queued_then_sent(self):
+        """Письмо сброса пароля ставится в очередь и доставляется
+        воркером."""
+        self.reset_password()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(self.stats()['queued'], 1)
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['test@yatube.ru'])
+        stats = self.stats()
+        self.assertEqual((stats['queued'], stats['sent']), (0, 1))
+        self.assertIsNotNone(stats['latency_p95'])
+
+    @override_settings(
+        EMAIL_QUEUE_BACKEND='core.tests.test_mail.FailingBackend')
+    def test_retry_with_backoff(self):
+        """Неудачная отправка повторяется позже, потом письмо -- failed."""
+        self.reset_password()
+        self.send()
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(
+            (email.status, email.attempts), (OutgoingEmail.QUEUED, 1))
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('SMTP', email.last_error)
+        self.send()
+        self.assertEqual(OutgoingEmail.objects.get().attempts, 1)
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        self.send()
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(
+            (email.status, email.attempts), (OutgoingEmail.FAILED, 2))
+        self.assertEqual(self.stats()['failed'], 1)
+
+    def test_expired_claim_is_retaken(self):
+        """Письмо упавшего воркера снова доставляется после захвата."""
+        self.reset_password()
+        OutgoingEmail.objects.update(
+            status=OutgoingEmail.SENDING, claim='dead',
+            next_attempt_at=timezone.now())
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_expired_claim_after_last_attempt_fails(self):
+        """Письмо, на котором воркер падал все попытки, не отправляется
+        снова, а помечается failed."""
+        self.reset_password()
+        OutgoingEmail.objects.update(
+            status=OutgoingEmail.SENDING, claim='dead', attempts=2,
+            next_attempt_at=timezone.now())
+        self.send()
+        self.assertEqual(mail.outbox, [])
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(
+            (email.status, email.attempts), (OutgoingEmail.FAILED, 3))
+        self.assertIn('TimeoutError', email.last_error)
+
+    def test_late_worker_does_not_overwrite(self):
+        """Воркер, чей захват истёк, не перезаписывает письмо, которое
+        захватил другой."""
+        self.reset_password()
+        stale = claim_batch(10, lease_seconds=0)
+        fresh = claim_batch(10, lease_seconds=60)
+        self.assertEqual(len(fresh), 1)
+        deliver(stale)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(
+            (email.status, email.claim, email.attempts),
+            (OutgoingEmail.SENDING, fresh[0].claim, 2))
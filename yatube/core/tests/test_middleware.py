@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template.backends.django import Template
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.middleware.sql_timing import _original_render, _timed_render
+from posts.models import Group, Post, User
+
+
+class SqlTimingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_disabled_by_default(self):
+        """Без настройки заголовка нет."""
+        with mock.patch.object(Template, 'render', _original_render):
+            response = self.guest_client.get(reverse('posts:index'))
+            self.assertFalse(response.has_header('Server-Timing'))
+            self.assertIsNot(Template.render, _timed_render)
+
+    @override_settings(SQL_TIMING_ENABLED=True, SQL_TIMING_THRESHOLD_MS=1000)
+    def test_server_timing(self):
+        """Server-Timing содержит SQL, шаблон и общее время."""
+        with mock.patch('core.middleware.sql_timing.logger') as logger:
+            response = self.guest_client.get(reverse('posts:index'))
+        header = response['Server-Timing']
+        self.assertRegex(header, r'sql;dur=[\d.]+;desc="3 queries"')
+        self.assertRegex(header, r'tpl;dur=[\d.]+')
+        self.assertRegex(header, r'total;dur=[\d.]+')
+        logger.warning.assert_not_called()
+
+    @override_settings(SQL_TIMING_ENABLED=True, SQL_TIMING_THRESHOLD_MS=0)
+    def test_slow_request_logged_with_explain(self):
+        """Медленный запрос пишется в лог вместе с планами SQL."""
+        with self.assertLogs('core.middleware.sql_timing') as logs:
+            self.guest_client.get(
+                reverse('posts:group_list', args=(self.group.slug,)))
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['path'], '/group/test_slug/')
+        self.assertEqual(line['queries'], 3)
+        self.assertEqual(len(line['slowest']), 3)
+        self.assertTrue(any(query['explain'] for query in line['slowest']))
+
+
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def dumps(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_slow_requests_dumped(self):
+        """Дампы сохраняются только для запросов дольше порога."""
+        url = reverse('posts:post_create')
+        with self.settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1,
+                           PROFILING_DIR=self.directory,
+                           PROFILING_THRESHOLD_MS=60 * 1000):
+            self.authorized_client.get(url)
+            self.assertEqual(self.dumps(), [])
+            with self.settings(PROFILING_THRESHOLD_MS=0):
+                self.authorized_client.get(url)
+        names = self.dumps()
+        self.assertEqual(len(names), 2)
+        self.assertTrue(names[0].endswith('.alloc.json'))
+        self.assertTrue(names[1].endswith('.prof'))
+        out = StringIO()
+        call_command(
+            'profile_report', dir=self.directory, path='create',
+            match='user_filters', stdout=out)
+        self.assertIn('Запросов: 1', out.getvalue())
+        self.assertRegex(
+            out.getvalue(), r'user_filters\.py:\d+\(addclass\)')
+
+    def test_rotation(self):
+        """Каталог дампов не растёт больше PROFILING_MAX_BYTES."""
+        old = os.path.join(self.directory, 'old.prof')
+        with open(old, 'wb') as target:
+            target.write(b'0' * 1024)
+        os.utime(old, (0, 0))
+        with self.settings(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1,
+                           PROFILING_DIR=self.directory,
+                           PROFILING_THRESHOLD_MS=0,
+                           PROFILING_MAX_BYTES=10 * 1024 * 1024):
+            self.authorized_client.get(reverse('posts:index'))
+            self.assertIn('old.prof', self.dumps())
+            with self.settings(PROFILING_MAX_BYTES=1):
+                self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(self.dumps(), [])
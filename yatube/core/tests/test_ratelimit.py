@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.ratelimit import (
+    LocalBackend, backends, get_backend, refund_token, take_token,
+)
+from posts.models import Post, User
+
+
+class TakeTokenTest(TestCase):
+    def test_bucket_refills(self):
+        """Ведро тратит маркеры и наполняется со временем."""
+        state = None
+        for _ in range(2):
+            allowed, state, _ = take_token(state, 2, 60, now=0)
+            self.assertTrue(allowed)
+        allowed, state, retry_after = take_token(state, 2, 60, now=0)
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 30)
+        self.assertTrue(take_token(state, 2, 60, now=30)[0])
+        self.assertEqual(refund_token(state, 2, 60, now=0), (1, 0))
+        self.assertEqual(refund_token((2, 0), 2, 60, now=0), (2, 0))
+
+
+@override_settings(RATELIMITS={'post_create': (2, 60), 'sign_up': (1, 60)})
+class RateLimitViewTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='TestUser')
+        cls.other = User.objects.create_user(username='Other')
+
+    def setUp(self):
+        cache.clear()
+        backends.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def create(self, client):
+        return client.post(reverse('posts:post_create'), {'text': 'Пост'})
+
+    def test_post_create_limited_per_user(self):
+        """Сверх лимита -- 429 без записи в базу; у другого своё ведро."""
+        for _ in range(2):
+            self.assertEqual(self.create(self.client).status_code, 302)
+        with self.assertNumQueries(0):
+            response = self.create(self.client)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(
+            self.client.get(reverse('posts:post_create')).status_code, 200)
+        other = Client()
+        other.force_login(self.other)
+        self.assertEqual(self.create(other).status_code, 302)
+
+    def sign_up(self, username, **extra):
+        return Client(**extra).post(reverse('users:signup'), {
+            'username': username,
+            'password1': 'sign-up-password-123',
+            'password2': 'sign-up-password-123',
+        })
+
+    def test_sign_up_limited_per_ip(self):
+        """Регистрация ограничена по IP анонима."""
+        self.assertEqual(
+            self.sign_up('first', REMOTE_ADDR='10.0.0.1').status_code, 302)
+        self.assertEqual(
+            self.sign_up('second', REMOTE_ADDR='10.0.0.1').status_code, 429)
+        self.assertEqual(
+            self.sign_up('third', REMOTE_ADDR='10.0.0.2').status_code, 302)
+
+    @override_settings(RATELIMIT_CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_client_ip_from_proxy_header(self):
+        """За прокси ведро -- по адресу, который дописал прокси."""
+        proxy = {'REMOTE_ADDR': '10.0.0.100'}
+        self.assertEqual(self.sign_up(
+            'first', HTTP_X_FORWARDED_FOR='1.1.1.1', **proxy,
+        ).status_code, 302)
+        self.assertEqual(self.sign_up(
+            'second', HTTP_X_FORWARDED_FOR='2.2.2.2, 1.1.1.1', **proxy,
+        ).status_code, 429)
+        self.assertEqual(self.sign_up(
+            'third', HTTP_X_FORWARDED_FOR='1.1.1.1, 2.2.2.2', **proxy,
+        ).status_code, 302)
+
+    def test_invalid_form_does_not_spend_limit(self):
+        """Форма с ошибками не расходует лимит."""
+        statuses = [
+            self.client.post(
+                reverse('posts:post_create'), {}).status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [200, 200, 200])
+        statuses = [self.create(self.client).status_code for _ in range(3)]
+        self.assertEqual(statuses, [302, 302, 429])
+
+    @override_settings(RATELIMIT_BACKEND='core.ratelimit.LocalBackend')
+    def test_local_backend(self):
+        """Вёдра в памяти процесса ограничивают так же."""
+        statuses = [self.create(self.client).status_code for _ in range(3)]
+        self.assertEqual(statuses, [302, 302, 429])
+        self.assertIsInstance(get_backend(), LocalBackend)
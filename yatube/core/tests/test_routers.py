@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import (Client, TestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import reverse
+
+from core.routers import (ReplicaRouter, pin_primary, reset_state,
+                          track_writes, wrote)
+from posts.models import Post, User
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        reset_state()
+        self.addCleanup(reset_state)
+
+    def test_routing(self):
+        """Запись -- в основную базу, чтение -- из реплики, пока поток
+        не закреплён и нет транзакции."""
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+        pin_primary()
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_only_real_writes_tracked(self):
+        """Запись отмечают выполненные INSERT/UPDATE/DELETE, а не выбор
+        базы для записи."""
+        self.router.db_for_write(Post)
+        self.assertFalse(wrote())
+        with connection.execute_wrapper(track_writes):
+            User.objects.get_or_create(username='TestUser')
+            self.assertTrue(wrote())
+            reset_state()
+            User.objects.get_or_create(username='TestUser')
+            self.assertFalse(wrote())
+
+    def test_pin_cookie_after_write(self):
+        """После записи клиент получает cookie закрепления."""
+        author = User.objects.create_user(username='TestUser')
+        client = Client()
+        client.force_login(author)
+        response = client.get(reverse('posts:index'))
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        response = client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'})
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReadYourWritesTest(TransactionTestCase):
+    """Основная база и реплика -- две базы SQLite; реплика не получает
+    записей, как сильно отставшая копия. Без REPLICA_DB_NAME реплика --
+    временный файл, созданный на время теста."""
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = None
+        if 'replica' not in connections.databases:
+            cls.directory = tempfile.mkdtemp()
+            connections.databases['replica'] = {
+                **connections.databases['default'],
+                'NAME': os.path.join(cls.directory, 'replica.sqlite3'),
+            }
+            call_command('migrate', database='replica', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.directory is not None:
+            connections['replica'].close()
+            del connections['replica']
+            del connections.databases['replica']
+            shutil.rmtree(cls.directory)
+
+    def test_author_sees_own_post(self):
+        """Автор видит свой пост сразу, остальные -- из реплики."""
+        author = User.objects.create_user(username='TestUser')
+        # Автор успел попасть в реплику, его новый пост -- нет
+        author.save(using='replica')
+        author_client = Client()
+        author_client.force_login(author)
+        response = author_client.post(
+            reverse('posts:post_create'), {'text': 'Свежий пост'},
+            follow=True)
+        self.assertContains(response, 'Свежий пост')
+        self.assertFalse(Post.objects.using('replica').exists())
+        response = Client().get(reverse('posts:index'))
+        self.assertNotContains(response, 'Свежий пост')
@@ -0,0 +1,83 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.views import IMMUTABLE, serve_static
+
+STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+
+class StaticPipelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.static_root, STATICFILES_STORAGE=STORAGE)
+        cls.settings.enable()
+        call_command(
+            'collectstatic', interactive=False, verbosity=0,
+            ignore_patterns=['admin'])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.css = self.hashed('css/bootstrap.min.css')
+
+    def hashed(self, name):
+        return staticfiles_storage.stored_name(name)
+
+    def serve(self, path, encoding=''):
+        request = self.factory.get(
+            '/static/' + path, HTTP_ACCEPT_ENCODING=encoding)
+        return serve_static(request, path)
+
+    def test_hashed_names_in_pages(self):
+        """Страницы ссылаются на файлы с хэшем в имени."""
+        self.assertRegex(self.css, r'^css/bootstrap\.min\.[0-9a-f]{12}\.css$')
+        response = self.client.get('/')
+        self.assertContains(response, '/static/' + self.css)
+
+    def test_compressed_siblings(self):
+        """Рядом с CSS лежит gzip-копия, у PNG её нет."""
+        path = os.path.join(self.static_root, self.css)
+        with open(path, 'rb') as original, open(path + '.gz', 'rb') as copy:
+            self.assertEqual(gzip.decompress(copy.read()), original.read())
+        logo = os.path.join(self.static_root, self.hashed('img/logo.png'))
+        self.assertFalse(os.path.exists(logo + '.gz'))
+
+    def test_serve_encoding_and_cache(self):
+        """Отдаётся сжатая копия по Accept-Encoding, кэш -- навсегда."""
+        response = self.serve(self.css, 'gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        response.close()
+        response = self.serve(self.css, 'gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        response.close()
+        response = self.serve(self.css, 'gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response.close()
+        response = self.serve('css/bootstrap.min.css')
+        self.assertNotEqual(response['Cache-Control'], IMMUTABLE)
+        response.close()
+
+    def test_serve_outside_root(self):
+        """Файлы вне STATIC_ROOT не отдаются."""
+        for path in ('../settings.py', 'missing.css'):
+            with self.subTest(path=path):
+                with self.assertRaises(Http404):
+                    self.serve(path)
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.conf import settings
+from django.template.base import Template
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.warmup import warm_up_templates
+from posts.models import Group, Post, User
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [('django.template.loaders.cached.Loader',
+                     settings.TEMPLATE_SOURCE_LOADERS)],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class TemplateWarmUpTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+
+    def test_no_parsing_after_warm_up(self):
+        """После прогрева страницы рендерятся без разбора шаблонов."""
+        self.assertGreater(warm_up_templates(), 20)
+        url_list = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+            reverse('posts:search'),
+            reverse('about:author'),
+        )
+        guest_client = Client()
+        with mock.patch.object(
+                Template, 'compile_nodelist', autospec=True,
+                side_effect=Template.compile_nodelist) as compile_nodelist:
+            for url in url_list:
+                with self.subTest(url=url):
+                    response = guest_client.get(url)
+                    self.assertEqual(response.status_code, 200)
+        compile_nodelist.assert_not_called()
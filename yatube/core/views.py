@@ -0,0 +1,60 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_safe
+
+from .storage import ENCODINGS
+
+# Имя файла с хэшем содержимого от ManifestStaticFilesStorage
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def accepted_encodings(request):
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    accepted = set()
+    for part in header.split(','):
+        encoding, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00'):
+            continue
+        accepted.add(encoding.strip().lower())
+    return accepted
+
+
+@require_safe
+def serve_static(request, path):
+    """Собранная статика из STATIC_ROOT.
+
+    Если клиент принимает br или gzip и рядом лежит сжатая копия,
+    отдаётся она. Файлы с хэшем в имени кэшируются навсегда.
+    FileResponse отдаёт файл через wsgi.file_wrapper (sendfile).
+    """
+    try:
+        filename = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(filename):
+        raise Http404
+    content_type, _ = mimetypes.guess_type(filename)
+    accepted = accepted_encodings(request)
+    served, encoding = filename, None
+    for name, suffix in ENCODINGS.items():
+        if name in accepted and os.path.isfile(filename + suffix):
+            served, encoding = filename + suffix, name
+            break
+    response = FileResponse(
+        open(served, 'rb'),
+        content_type=content_type or 'application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response['Cache-Control'] = (
+        IMMUTABLE if HASHED_NAME.search(path)
+        else 'public, max-age=%s' % settings.STATIC_MAX_AGE)
+    return response
@@ -0,0 +1,31 @@
+import logging
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_templates():
+    """Компилирует все шаблоны из DIRS движков Django заранее, чтобы
+    кэширующий загрузчик отдавал их первому запросу готовыми.
+
+    Возвращает число скомпилированных шаблонов.
+    """
+    count = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in engine.engine.dirs:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    path = os.path.relpath(
+                        os.path.join(root, name), directory)
+                    try:
+                        engine.get_template(path.replace(os.sep, '/'))
+                    except TemplateSyntaxError:
+                        logger.exception('Шаблон %s не компилируется', path)
+                    else:
+                        count += 1
+    return count
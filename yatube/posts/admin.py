@@ -1,15 +1,111 @@
+import datetime
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.widgets import ForeignKeyRawIdWidget
+from django.utils import timezone
+
+from yatube.utils import CachedCountPaginator
+
+from .cache import GLOBAL_SCOPE
+from .models import Group, Post, PostQuerySet
+from .search import search_posts
+
+# Больше этого числа строк отфильтрованный список не считает
+ADMIN_COUNT_LIMIT = 10000
+
+
+class PostAdminPaginator(CachedCountPaginator):
+    """Без полного COUNT(*): общий список берёт число постов из кэша
+    (или оценку), отфильтрованный считает не больше ADMIN_COUNT_LIMIT."""
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True):
+        scope = None if object_list.query.has_filters() else GLOBAL_SCOPE
+        super().__init__(
+            object_list, per_page, scope=scope,
+            estimate=Post.objects.estimated_count,
+            orphans=orphans, allow_empty_first_page=allow_empty_first_page)
+
+    def get_count(self):
+        if self.scope is None:
+            return self.object_list.order_by()[:ADMIN_COUNT_LIMIT].count()
+        return super().get_count()
 
-from .models import Group, Post
+
+class ChangeListQuerySet(PostQuerySet):
+    def dates(self, field_name, kind, order='ASC'):
+        """Даты для date_hierarchy поиском по индексу: один запрос
+        на каждый найденный год, месяц или день вместо прохода по всем
+        строкам."""
+        tzinfo = timezone.get_current_timezone() if settings.USE_TZ else None
+        values = self.order_by(field_name).values_list(field_name, flat=True)
+        result = []
+        start = None
+        while True:
+            queryset = values
+            if start is not None:
+                queryset = values.filter(**{field_name + '__gte': start})
+            value = queryset.first()
+            if value is None:
+                break
+            if tzinfo is not None:
+                value = timezone.localtime(value, tzinfo)
+            day = value.date()
+            if kind == 'year':
+                day = day.replace(month=1, day=1)
+                following = day.replace(year=day.year + 1)
+            elif kind == 'month':
+                day = day.replace(day=1)
+                following = (day + datetime.timedelta(days=32)).replace(day=1)
+            else:
+                following = day + datetime.timedelta(days=1)
+            result.append(day)
+            start = datetime.datetime.combine(following, datetime.time.min)
+            if tzinfo is not None:
+                start = timezone.make_aware(start, tzinfo)
+        if order == 'DESC':
+            result.reverse()
+        return result
+
+
+class GroupIdWidget(ForeignKeyRawIdWidget):
+    """Поле id группы с поиском во всплывающем окне, без запроса
+    к группам на каждую строку списка."""
+
+    def label_and_url_for_value(self, value):
+        return '', ''
 
 
 class PostAdmin(admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group',)
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    raw_id_fields = ('author', 'group')
+    show_full_result_count = False
+    paginator = PostAdminPaginator
     empty_value_display = '-пусто-'
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return ChangeListQuerySet(
+            model=queryset.model, query=queryset.query, using=queryset.db)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs['widgets'] = {
+            'group': GroupIdWidget(
+                Post._meta.get_field('group').remote_field, self.admin_site),
+        }
+        return super().get_changelist_form(request, **kwargs)
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
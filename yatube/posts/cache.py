@@ -0,0 +1,203 @@
+import hashlib
+import math
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from yatube.utils import invalidate_page_counts, requested_position
+
+GLOBAL_SCOPE = 'global'
+
+
+def invalidate_feed_count():
+    """Сбрасывает закэшированное число постов общей ленты; у лент групп
+    и авторов число берётся из счётчиков в базе."""
+    invalidate_page_counts(GLOBAL_SCOPE)
+
+
+def page_version_key(path):
+    return 'page_version:%s' % path
+
+
+def new_page_version(previous=None):
+    """Версия страниц: '<uuid>.<время создания>'.
+
+    Время строго больше, чем у предыдущей версии, чтобы Last-Modified
+    рос при каждом сбросе, даже нескольких за одну секунду.
+    """
+    created = math.ceil(time.time())
+    if previous is not None:
+        created = max(created, page_version_time(previous) + 1)
+    return '%s.%s' % (uuid.uuid4().hex, created)
+
+
+def page_version_time(version):
+    _, _, created = version.rpartition('.')
+    return int(created) if created.isdigit() else 0
+
+
+def page_version(path):
+    """Версия страниц по адресу; сброс версии делает их недоступными.
+
+    Версии хранятся в CACHES['default']: если процессов несколько,
+    кэш должен быть общим (memcached, redis), иначе сброс виден
+    только процессу, который его сделал.
+    """
+    key = page_version_key(path)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_page_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def page_params(request):
+    return '%s=%s' % requested_position(request)
+
+
+def is_canonical_page(request):
+    """Можно ли хранить ответ под ключом page_params.
+
+    Страница ленты -- если пагинатор выбрал ровно запрошенную: номер
+    вне диапазона и курсор с чужими ключами дают другую страницу,
+    и каждый такой вариант адреса занимал бы в кэше свою копию.
+    Страница без пагинации -- только без параметров page и cursor.
+    """
+    position = getattr(request, 'page_position', None)
+    if position is None:
+        return not ('page' in request.GET or 'cursor' in request.GET)
+    return position == requested_position(request)
+
+
+def page_cache_key(request):
+    digest = hashlib.md5(
+        ('%s?%s' % (request.path, page_params(request))).encode()
+    ).hexdigest()
+    return 'page:%s:%s' % (page_version(request.path), digest)
+
+
+def anonymous_cache_page(view):
+    """Кэширует ответ view целиком для анонимных GET-запросов."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timeout = settings.FEED_CACHE_SECONDS
+        if (not timeout or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated):
+            return view(request, *args, **kwargs)
+        key = page_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        response = view(request, *args, **kwargs)
+        if (response.status_code == 200 and not response.cookies
+                and is_canonical_page(request)):
+            cache.set(
+                key, (response.content, response['Content-Type']), timeout)
+        return response
+    return wrapper
+
+
+def feed_condition(validators):
+    """Условный GET для лент и страницы поста.
+
+    validators(**kwargs) выполняет один агрегирующий запрос и возвращает
+    словарь, в котором 'latest' -- наибольший updated_at в области.
+    ETag учитывает ещё версию страниц адреса (её сбрасывает и удаление
+    поста), номер страницы и пользователя; Last-Modified -- не раньше
+    времени создания этой версии.
+    """
+    def get_validators(request, *args, **kwargs):
+        if not hasattr(request, 'feed_validators'):
+            request.feed_validators = validators(*args, **kwargs)
+        return request.feed_validators
+
+    def etag(request, *args, **kwargs):
+        values = get_validators(request, *args, **kwargs)
+        if values['latest'] is None:
+            return None
+        raw = '|'.join(str(value) for value in (
+            sorted(values.items()),
+            page_version(request.path),
+            page_params(request),
+            request.user.pk,
+        ))
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return None
+        latest = get_validators(request, *args, **kwargs)['latest']
+        if latest is None:
+            return None
+        # Удаление поста не меняет MAX(updated_at), но сбрасывает версию
+        purged = datetime.fromtimestamp(
+            page_version_time(page_version(request.path)), timezone.utc)
+        return max(latest, purged)
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def purge_pages(*paths):
+    keys = [page_version_key(path) for path in paths]
+
+    def bump():
+        current = cache.get_many(keys)
+        cache.set_many({
+            key: new_page_version(current.get(key)) for key in keys
+        }, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def purge_post_pages(post, *group_slugs):
+    """Сбрасывает страницы, на которых виден пост: общую ленту, ленту
+    группы, профиль автора и страницу самого поста."""
+    paths = [
+        reverse('posts:index'),
+        reverse('posts:profile', args=(post.author.username,)),
+        reverse('posts:post_detail', args=(post.pk,)),
+    ]
+    if post.group_id is not None:
+        group_slugs += (post.group.slug,)
+    paths += [
+        reverse('posts:group_list', args=(slug,))
+        for slug in set(group_slugs) if slug
+    ]
+    purge_pages(*paths)
+
+
+def purge_author_pages(usernames, group_slugs):
+    """Сбрасывает общую ленту, профили авторов и ленты групп после
+    вставки пачки постов: их страницы поста ещё не закэшированы."""
+    purge_pages(
+        reverse('posts:index'),
+        *[reverse('posts:profile', args=(name,)) for name in usernames],
+        *[reverse('posts:group_list', args=(slug,))
+          for slug in group_slugs if slug],
+    )
+
+
+def purge_card_pages(posts, *paths):
+    """Сбрасывает общую ленту и все страницы, где видны карточки posts:
+    профили авторов, ленты групп и страницы самих постов, -- и ещё
+    paths. Для правки группы или автора, которые видны в карточках."""
+    profiles, groups, details = set(), set(), []
+    for pk, username, slug in posts.values_list(
+            'pk', 'author__username', 'group__slug'):
+        profiles.add(reverse('posts:profile', args=(username,)))
+        if slug:
+            groups.add(reverse('posts:group_list', args=(slug,)))
+        details.append(reverse('posts:post_detail', args=(pk,)))
+    purge_pages(
+        reverse('posts:index'), *paths, *profiles, *groups, *details)
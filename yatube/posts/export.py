@@ -0,0 +1,78 @@
+import csv
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Post
+
+EXPORT_FORMATS = ('jsonl', 'csv')
+EXPORT_FIELDS = ('id', 'pub_date', 'author__username', 'group__slug', 'text')
+EXPORT_COLUMNS = ('id', 'pub_date', 'author', 'group', 'text')
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+# Сколько строк курсор забирает из базы за раз
+EXPORT_CHUNK_SIZE = 2000
+
+
+def parse_since(since, since_id=None):
+    """Разбирает границу выгрузки; ValueError при неверных значениях."""
+    if not since:
+        return None
+    pub_date = parse_datetime(since)
+    if pub_date is None:
+        raise ValueError('Неверная дата since: %r' % since)
+    if settings.USE_TZ and timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date)
+    return pub_date, int(since_id) if since_id else None
+
+
+def export_rows(author=None, group=None, since=None):
+    """Строки постов от старых к новым, без создания объектов моделей.
+
+    since -- пара (pub_date, id) из parse_since: выгружаются посты
+    строго позже неё, так что повторная выгрузка с последней строки
+    предыдущей продолжает её без повторов.
+    """
+    queryset = Post.objects.order_by('pub_date', 'id')
+    if author is not None:
+        queryset = queryset.filter(author=author)
+    if group is not None:
+        queryset = queryset.filter(group=group)
+    if since is not None:
+        pub_date, post_id = since
+        condition = Q(pub_date__gt=pub_date)
+        if post_id is not None:
+            condition |= Q(pub_date=pub_date, id__gt=post_id)
+        queryset = queryset.filter(condition)
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE)
+    for row in rows:
+        row = dict(zip(EXPORT_COLUMNS, row))
+        # Полная точность даты: по ней продолжают выгрузку через since
+        row['pub_date'] = row['pub_date'].isoformat()
+        yield row
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def render_rows(rows, export_format):
+    """Строки выгрузки в формате jsonl или csv, по одной записи."""
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            yield writer.writerow(
+                [row[column] for column in EXPORT_COLUMNS])
+        return
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n'
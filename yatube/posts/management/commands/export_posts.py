@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import EXPORT_FORMATS, export_rows, parse_since, render_rows
+from posts.models import Group, User
+
+
+class Command(BaseCommand):
+    help = ('Выгружает посты автора, группы или всего сайта в JSONL или CSV '
+            'от старых к новым.')
+
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group()
+        scope.add_argument('--author', help='Username автора.')
+        scope.add_argument('--group', help='Slug группы.')
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='jsonl')
+        parser.add_argument(
+            '--since',
+            help='Выгрузить посты, опубликованные позже этой даты.',
+        )
+        parser.add_argument(
+            '--since-id',
+            help='id последнего выгруженного поста с датой --since.',
+        )
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию stdout.')
+
+    def handle(self, *args, **options):
+        filters = {}
+        try:
+            if options['author']:
+                filters['author'] = User.objects.get(
+                    username=options['author'])
+            if options['group']:
+                filters['group'] = Group.objects.get(slug=options['group'])
+            since = parse_since(options['since'], options['since_id'])
+        except (User.DoesNotExist, Group.DoesNotExist, ValueError) as error:
+            raise CommandError(error)
+
+        chunks = render_rows(
+            export_rows(since=since, **filters), options['format'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as target:
+                count = self.write_chunks(target, chunks)
+        else:
+            count = self.write_chunks(self.stdout, chunks)
+        if options['format'] == 'csv':
+            # Без строки заголовка
+            count -= 1
+        self.stderr.write('Выгружено записей: %s' % count)
+
+    def write_chunks(self, target, chunks):
+        count = 0
+        for chunk in chunks:
+            target.write(chunk)
+            count += 1
+        return count
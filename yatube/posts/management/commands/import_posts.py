@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.models import Group, ImportCheckpoint, Post
+
+User = get_user_model()
+
+FORMATS = ('jsonl', 'csv')
+
+
+class SkipRecord(Exception):
+    """Запись нельзя импортировать; текст -- причина."""
+
+
+class Command(BaseCommand):
+    help = ('Потоково импортирует посты из JSONL или CSV с полями '
+            'text, author (username), group (slug), pub_date.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с постами.')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат файла; по умолчанию по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько постов вставлять за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Имя записи о прогрессе в базе; по умолчанию полный '
+                 'путь к файлу.',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать сначала, не глядя на сохранённый прогресс.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+        file_format = options['format'] or (
+            'csv' if path.lower().endswith('.csv') else 'jsonl')
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+            name=options['checkpoint'] or os.path.abspath(path))
+        done = 0 if options['restart'] else checkpoint.done
+
+        self.authors = dict(User.objects.values_list('username', 'id'))
+        self.groups = dict(Group.objects.values_list('slug', 'id'))
+        self.imported = self.skipped = 0
+        started = time.perf_counter()
+        try:
+            with open(path, encoding='utf-8', newline='') as source:
+                records = enumerate(self.read(source, file_format), 1)
+                if done:
+                    self.stdout.write('Продолжаем с записи %s' % (done + 1))
+                    records = islice(records, done, None)
+                while True:
+                    batch = list(islice(records, options['batch_size']))
+                    if not batch:
+                        break
+                    self.import_batch(batch, checkpoint)
+                    if options['verbosity'] > 1:
+                        self.stdout.write('Записей: %s' % checkpoint.done)
+        except OSError as error:
+            raise CommandError(error)
+        checkpoint.delete()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Импортировано постов: %s, пропущено: %s, %.1f c '
+            '(%.0f постов/с)' % (
+                self.imported, self.skipped, elapsed,
+                self.imported / elapsed if elapsed else 0)))
+
+    def read(self, source, file_format):
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+    def import_batch(self, batch, checkpoint):
+        """Вставляет пачку и сдвигает прогресс в одной транзакции."""
+        posts, dates = [], []
+        for number, record in batch:
+            try:
+                post, pub_date = self.build_post(record)
+            except SkipRecord as reason:
+                self.skip(number, reason)
+                self.skipped += 1
+            else:
+                posts.append(post)
+                dates.append(pub_date)
+        with transaction.atomic():
+            last_id = Post.objects.aggregate(last_id=Max('id'))['last_id']
+            Post.objects.bulk_create(posts)
+            self.restore_dates(posts, dates, last_id)
+            checkpoint.done = batch[-1][0]
+            checkpoint.save(update_fields=['done'])
+        self.imported += len(posts)
+
+    def restore_dates(self, posts, dates, last_id):
+        """Ставит постам даты из файла: bulk_create берёт pub_date
+        из auto_now_add. updated_at равен pub_date, чтобы старые посты
+        не выглядели только что изменёнными."""
+        if not posts:
+            return
+        if posts[0].pk is None:
+            # SQLite не возвращает id из bulk_create; внутри транзакции
+            # вставленные посты -- все, что новее last_id
+            ids = Post.objects.filter(id__gt=last_id or 0).order_by(
+                'id').values_list('id', flat=True)
+            for post, pk in zip(posts, ids):
+                post.pk = pk
+        for post, pub_date in zip(posts, dates):
+            post.pub_date = post.updated_at = pub_date
+        Post.objects.bulk_update(posts, ['pub_date', 'updated_at'])
+
+    def build_post(self, record):
+        if not isinstance(record, dict):
+            raise SkipRecord('не удалось разобрать запись')
+        text = (record.get('text') or '').strip()
+        if not text:
+            raise SkipRecord('пустой текст')
+        post = Post(
+            text=text,
+            author_id=self.parse_author(record.get('author')),
+            group_id=self.parse_group(record.get('group')),
+        )
+        return post, self.parse_date(record.get('pub_date'))
+
+    def parse_author(self, username):
+        author_id = self.authors.get(username)
+        if author_id is None:
+            raise SkipRecord('нет автора %r' % username)
+        return author_id
+
+    def parse_group(self, slug):
+        if not slug:
+            return None
+        group_id = self.groups.get(slug)
+        if group_id is None:
+            raise SkipRecord('нет группы %r' % slug)
+        return group_id
+
+    def parse_date(self, value):
+        if not value:
+            return timezone.now()
+        try:
+            pub_date = parse_datetime(value)
+        except ValueError:
+            pub_date = None
+        if pub_date is None:
+            raise SkipRecord('неверная дата %r' % value)
+        if settings.USE_TZ and timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+        return pub_date
+
+    def skip(self, number, reason):
+        self.stderr.write('Запись %s пропущена: %s' % (number, reason))
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from posts.models import AuthorCounter, Group, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп с нуля.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не меняя.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = self.rebuild_authors(options['dry_run'])
+            drift += self.rebuild_groups(options['dry_run'])
+        if drift:
+            self.stdout.write(self.style.WARNING(
+                'Расхождений: %s' % drift))
+        else:
+            self.stdout.write(self.style.SUCCESS('Расхождений нет'))
+
+    def report(self, kind, pk, stored, actual):
+        self.stdout.write(
+            '%s %s: было %s, должно быть %s' % (kind, pk, stored, actual))
+
+    def rebuild_authors(self, dry_run):
+        actual = dict(Post.objects.order_by().values_list(
+            'author_id').annotate(Count('id')))
+        stored = dict(AuthorCounter.objects.values_list(
+            'author_id', 'post_count'))
+        drift = 0
+        for author_id in actual.keys() | stored.keys():
+            count = actual.get(author_id, 0)
+            if stored.get(author_id) == count:
+                continue
+            drift += 1
+            self.report('author', author_id, stored.get(author_id), count)
+            if not dry_run:
+                AuthorCounter.objects.update_or_create(
+                    author_id=author_id, defaults={'post_count': count})
+        return drift
+
+    def rebuild_groups(self, dry_run):
+        actual = dict(Post.objects.filter(group__isnull=False).order_by(
+        ).values_list('group_id').annotate(Count('id')))
+        drift = 0
+        for group_id, stored in Group.objects.values_list(
+                'pk', 'post_count').iterator():
+            count = actual.get(group_id, 0)
+            if stored == count:
+                continue
+            drift += 1
+            self.report('group', group_id, stored, count)
+            if not dry_run:
+                Group.objects.filter(pk=group_id).update(post_count=count)
+        return drift
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Заново строит полнотекстовый индекс постов.'
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            raise CommandError(
+                'Полнотекстовый индекс поддерживается только для SQLite')
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            'Проиндексировано постов: %s' % count))
@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-17 02:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_post_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Group = apps.get_model('posts', 'Group')
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    author_counts = Post.objects.order_by().values('author_id').annotate(
+        total=models.Count('id'))
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(author_id=row['author_id'], post_count=row['total'])
+        for row in author_counts
+    )
+    group_counts = Post.objects.filter(group__isnull=False).order_by().values(
+        'group_id').annotate(total=models.Count('id'))
+    for row in group_counts:
+        Group.objects.filter(pk=row['group_id']).update(
+            post_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0007_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorCounter',
+            fields=[
+                ('author', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    primary_key=True,
+                    related_name='post_counter',
+                    serialize=False,
+                    to=settings.AUTH_USER_MODEL,
+                    verbose_name='Автор')),
+                ('post_count', models.PositiveIntegerField(
+                    default=0, verbose_name='Число постов')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='post_count',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name='Число постов'),
+        ),
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-17 02:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID')),
+                ('name', models.CharField(
+                    max_length=255, unique=True, verbose_name='Импорт')),
+                ('done', models.PositiveIntegerField(
+                    default=0, verbose_name='Обработано записей')),
+            ],
+        ),
+    ]
@@ -1,5 +1,13 @@
+from collections import Counter
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Max
+
+from .cache import (
+    invalidate_feed_count, purge_author_pages, purge_post_pages,
+)
+from .search import index_posts_after
 
 User = get_user_model()
 
@@ -19,11 +27,108 @@ class Group(models.Model):
         verbose_name='Описание группы',
         help_text='Введите описание группы',
     )
+    post_count = models.PositiveIntegerField(
+        verbose_name='Число постов',
+        default=0,
+        editable=False,
+    )
 
     def __str__(self):
         return self.title
 
 
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter',
+        verbose_name='Автор',
+    )
+    post_count = models.PositiveIntegerField(
+        verbose_name='Число постов',
+        default=0,
+    )
+
+    def __str__(self):
+        return '%s: %s' % (self.author_id, self.post_count)
+
+
+def get_post_count(author):
+    """Число постов автора из счётчика, без COUNT(*) по постам."""
+    try:
+        return author.post_counter.post_count
+    except AuthorCounter.DoesNotExist:
+        return 0
+
+
+def update_post_counters(author_deltas, group_deltas):
+    """Сдвигает счётчики постов; вызывается внутри транзакции записи."""
+    for author_id, delta in author_deltas.items():
+        if author_id is None or not delta:
+            continue
+        updated = AuthorCounter.objects.filter(author_id=author_id).update(
+            post_count=F('post_count') + delta)
+        if not updated and delta > 0:
+            AuthorCounter.objects.create(
+                author_id=author_id,
+                post_count=Post.objects.filter(author_id=author_id).count(),
+            )
+    for group_id, delta in group_deltas.items():
+        if group_id is None or not delta:
+            continue
+        Group.objects.filter(pk=group_id).update(
+            post_count=F('post_count') + delta)
+    # Правка текста или перенос поста не меняют число постов на сайте
+    if sum(delta for pk, delta in author_deltas.items() if pk is not None):
+        invalidate_feed_count()
+
+
+FEED_FIELDS = (
+    'id', 'text', 'pub_date', 'updated_at',
+    'author__username', 'author__first_name', 'author__last_name',
+    'group__slug', 'group__title',
+)
+
+
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        """Посты для лент и страницы поста без лишних запросов."""
+        return self.select_related('author', 'group').only(*FEED_FIELDS)
+
+    def detail(self):
+        """Пост вместе со счётчиком постов автора."""
+        return self.select_related(
+            'author__post_counter', 'group',
+        ).only(*FEED_FIELDS, 'author__post_counter__post_count')
+
+    def last_modified(self, **extra):
+        """Время последнего изменения постов одним агрегирующим запросом."""
+        return self.aggregate(latest=Max('updated_at'), **extra)
+
+    def estimated_count(self):
+        """Оценка сверху по наибольшему id: без прохода по индексу."""
+        return self.aggregate(last_id=Max('id'))['last_id'] or 0
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            last_id = self.model._base_manager.using(self.db).aggregate(
+                last_id=Max('id'))['last_id']
+            objs = super().bulk_create(objs, *args, **kwargs)
+            index_posts_after(last_id, using=self.db)
+            authors = Counter(post.author_id for post in objs)
+            groups = Counter(post.group_id for post in objs)
+            update_post_counters(authors, groups)
+            purge_author_pages(
+                User.objects.using(self.db).filter(
+                    pk__in=authors).values_list('username', flat=True),
+                Group.objects.using(self.db).filter(
+                    pk__in=[pk for pk in groups if pk is not None]
+                ).values_list('slug', flat=True),
+            )
+        return objs
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст поста',
@@ -33,11 +138,16 @@ class Post(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='posts',
         verbose_name='Автор',
+        db_index=False,
     )
     group = models.ForeignKey(
         Group,
@@ -47,10 +157,68 @@ class Post(models.Model):
         related_name='posts',
         verbose_name='Группа',
         help_text='Группа, к которой будет относиться пост',
+        db_index=False,
     )
 
+    objects = PostQuerySet.as_manager()
+
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = {}
+            if not self._state.adding:
+                previous = Post.objects.filter(pk=self.pk).values(
+                    'author_id', 'group_id', 'group__slug').first() or {}
+            super().save(*args, **kwargs)
+            author_deltas = Counter({self.author_id: 1})
+            author_deltas.subtract({previous.get('author_id'): 1})
+            group_deltas = Counter({self.group_id: 1})
+            group_deltas.subtract({previous.get('group_id'): 1})
+            update_post_counters(author_deltas, group_deltas)
+            purge_post_pages(self, previous.get('group__slug'))
+
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-id']
+        # Индексы лент: общая, автора и группы. Они же заменяют
+        # одиночные индексы внешних ключей.
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'], name='post_feed_idx'),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx'),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_feed_idx'),
+            # Для MAX(updated_at) в условных GET-запросах
+            models.Index(
+                fields=['updated_at'], name='post_updated_idx'),
+            models.Index(
+                fields=['author', 'updated_at'],
+                name='post_author_updated_idx'),
+            models.Index(
+                fields=['group', 'updated_at'],
+                name='post_group_updated_idx'),
+        ]
+
+
+class ImportCheckpoint(models.Model):
+    """Прогресс import_posts: сколько записей файла уже обработано.
+
+    Обновляется в той же транзакции, что и пачка постов, поэтому после
+    сбоя импорт продолжается ровно с первой незаписанной пачки.
+    """
+    name = models.CharField(
+        verbose_name='Импорт',
+        max_length=255,
+        unique=True,
+    )
+    done = models.PositiveIntegerField(
+        verbose_name='Обработано записей',
+        default=0,
+    )
+
+    def __str__(self):
+        return '%s: %s' % (self.name, self.done)
@@ -0,0 +1,71 @@
+from django.db import connections, transaction
+
+FTS_TABLE = 'posts_post_fts'
+POST_TABLE = 'posts_post'
+
+
+def fts_enabled(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def index_post(post, using='default'):
+    if not fts_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM %s WHERE rowid = %%s' % FTS_TABLE, [post.pk])
+        cursor.execute(
+            'INSERT INTO %s (rowid, text) VALUES (%%s, %%s)' % FTS_TABLE,
+            [post.pk, post.text])
+
+
+def unindex_post(post, using='default'):
+    if not fts_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM %s WHERE rowid = %%s' % FTS_TABLE, [post.pk])
+
+
+def index_posts_after(last_id, using='default'):
+    """Индексирует посты с id больше last_id (после bulk_create)."""
+    if not fts_enabled(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO %s (rowid, text) SELECT id, text FROM %s '
+            'WHERE id > %%s' % (FTS_TABLE, POST_TABLE), [last_id or 0])
+
+
+def rebuild_index(using='default'):
+    """Строит индекс заново и возвращает число проиндексированных постов."""
+    with transaction.atomic(using), connections[using].cursor() as cursor:
+        cursor.execute('DELETE FROM %s' % FTS_TABLE)
+        cursor.execute(
+            'INSERT INTO %s (rowid, text) SELECT id, text FROM %s'
+            % (FTS_TABLE, POST_TABLE))
+        return cursor.rowcount
+
+
+def match_query(text):
+    """Запрос FTS5 из слов пользователя: все слова, каждое как префикс."""
+    words = text.split()
+    return ' '.join('"%s"*' % word.replace('"', '""') for word in words)
+
+
+def search_posts(queryset, text):
+    """Посты, подходящие под запрос, от самых релевантных."""
+    query = match_query(text)
+    if not query:
+        return queryset.none()
+    if not fts_enabled(queryset.db):
+        return queryset.filter(text__icontains=text.strip())
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            '%s.rowid = %s.id' % (FTS_TABLE, POST_TABLE),
+            '%s MATCH %%s' % FTS_TABLE,
+        ],
+        params=[query],
+        order_by=['%s.rank' % FTS_TABLE],
+    )
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+
+from .cache import purge_card_pages, purge_post_pages
+from .models import Group, Post, User, update_post_counters
+from .search import index_post, unindex_post
+
+
+@receiver(post_delete, sender=Post)
+def decrease_post_counters(sender, instance, **kwargs):
+    update_post_counters({instance.author_id: -1}, {instance.group_id: -1})
+
+
+@receiver(post_delete, sender=Post)
+def purge_deleted_post_pages(sender, instance, **kwargs):
+    purge_post_pages(instance)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, using, update_fields, **kwargs):
+    if update_fields is None or 'text' in update_fields:
+        index_post(instance, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    unindex_post(instance, using=using)
+
+
+def shown_fields_changed(created, update_fields, fields):
+    """Изменились ли поля, которые видны на страницах с постами;
+    у нового объекта постов ещё нет."""
+    if created:
+        return False
+    return update_fields is None or not fields.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Group)
+def purge_edited_group_pages(sender, instance, created, update_fields,
+                             **kwargs):
+    if shown_fields_changed(
+            created, update_fields, {'title', 'slug', 'description'}):
+        purge_card_pages(
+            Post.objects.filter(group=instance),
+            reverse('posts:group_list', args=(instance.slug,)))
+
+
+@receiver(post_save, sender=User)
+def purge_edited_author_pages(sender, instance, created, update_fields,
+                              **kwargs):
+    # Вход пользователя сохраняет только last_login
+    if shown_fields_changed(
+            created, update_fields, {'username', 'first_name', 'last_name'}):
+        purge_card_pages(
+            Post.objects.filter(author=instance),
+            reverse('posts:profile', args=(instance.username,)))
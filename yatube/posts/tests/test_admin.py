@@ -0,0 +1,80 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..admin import ChangeListQuerySet
+from ..models import Group, Post, User
+
+
+class PostAdminTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@yatube.ru', 'password')
+        cls.groups = Group.objects.bulk_create([Group(
+            title='Группа %s' % i,
+            slug='group_%s' % i,
+            description='Описание',
+        ) for i in range(5)])
+        cls.groups = list(Group.objects.all())
+        Post.objects.bulk_create([Post(
+            text='Тестовый текст %s' % i,
+            author=User.objects.create_user(username='user%s' % i),
+            group=cls.groups[i % len(cls.groups)],
+        ) for i in range(30)])
+        dates = (
+            datetime.datetime(2020, 3, 5, 12),
+            datetime.datetime(2020, 3, 20, 12),
+            datetime.datetime(2021, 7, 1, 12),
+        )
+        for post, date in zip(Post.objects.order_by('id'), dates):
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=timezone.make_aware(date))
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+
+    def test_changelist_queries_do_not_depend_on_rows(self):
+        """Число запросов списка постов не зависит от числа строк."""
+        self.admin_client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(len(queries), 15)
+        self.assertFalse([
+            query['sql'] for query in queries
+            if 'COUNT(' in query['sql'] or 'posts_group"."id" = ' in
+            query['sql']
+        ])
+
+    def test_filtered_count_is_limited(self):
+        """Отфильтрованный список считает строки с ограничением."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(self.url, {'q': 'текст'})
+        self.assertEqual(response.context['cl'].result_count, 30)
+        self.assertTrue([
+            query['sql'] for query in queries
+            if 'COUNT(' in query['sql'] and 'LIMIT' in query['sql']
+        ])
+
+    def test_date_hierarchy_uses_seek(self):
+        """Даты date_hierarchy совпадают с QuerySet.dates()."""
+        queryset = ChangeListQuerySet(model=Post)
+        for kind in ('year', 'month', 'day'):
+            with self.subTest(kind=kind):
+                self.assertEqual(
+                    queryset.dates('pub_date', kind),
+                    list(Post.objects.dates('pub_date', kind)))
+        response = self.admin_client.get(
+            self.url, {'pub_date__year': 2020, 'pub_date__month': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 2)
@@ -0,0 +1,324 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+@override_settings(FEED_CACHE_SECONDS=60)
+class AnonymousPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.other = User.objects.create_user(username='OtherUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.scnd_group = Group.objects.create(
+            title='Вторая тест группа',
+            slug='scnd_test_slug',
+            description='Описание второй',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+        cls.other_post = Post.objects.create(
+            author=cls.other,
+            text='Чужой текст',
+            group=cls.scnd_group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+        self.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:group_list', args=(self.group.slug,)),
+            'scnd_group': reverse(
+                'posts:group_list', args=(self.scnd_group.slug,)),
+            'profile': reverse('posts:profile', args=(self.author.username,)),
+            'other_profile': reverse(
+                'posts:profile', args=(self.other.username,)),
+            'detail': reverse('posts:post_detail', args=(self.post.pk,)),
+            'other_detail': reverse(
+                'posts:post_detail', args=(self.other_post.pk,)),
+        }
+
+    def warm_up(self):
+        for url in self.urls.values():
+            self.guest_client.get(url)
+
+    def cached(self):
+        """Имена страниц, которые отдаются из кэша без рендеринга."""
+        names = set()
+        for name, url in self.urls.items():
+            response = self.guest_client.get(url)
+            if response.context is None:
+                names.add(name)
+        return names
+
+    def test_anonymous_pages_cached(self):
+        """Повторный анонимный запрос выполняет только запрос валидаторов
+        условного GET."""
+        self.warm_up()
+        for name, url in self.urls.items():
+            with self.subTest(name=name):
+                with self.assertNumQueries(1):
+                    response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_pages_keyed_by_page_number(self):
+        """Номер страницы входит в ключ кэша."""
+        self.guest_client.get(self.urls['index'])
+        response = self.guest_client.get(self.urls['index'], {'page': 2})
+        self.assertIsNotNone(response.context)
+
+    def test_page_variants_share_one_entry(self):
+        """Варианты записи номера и испорченные курсоры не занимают
+        в кэше по своей копии, а номер вне диапазона не кэшируется."""
+        url = self.urls['index']
+        self.guest_client.get(url)
+        self.guest_client.get(url, {'cursor': 'испорчен'})
+        shared = [
+            {'page': '1'}, {'page': '01'}, {'page': 'abc'},
+            {'cursor': 'другой'}, {'cursor': 'bjox'},
+        ]
+        for params in shared:
+            with self.subTest(params=params):
+                response = self.guest_client.get(url, params)
+                self.assertIsNone(response.context)
+        for page in ('99999', '0'):
+            with self.subTest(page=page):
+                self.guest_client.get(url, {'page': page})
+                response = self.guest_client.get(url, {'page': page})
+                self.assertIsNotNone(response.context)
+
+    def test_detail_with_page_params_not_cached(self):
+        """Параметры page и cursor у страницы без пагинации не дают
+        новых копий в кэше."""
+        url = self.urls['detail']
+        self.guest_client.get(url, {'page': 5})
+        response = self.guest_client.get(url, {'page': 5})
+        self.assertIsNotNone(response.context)
+
+    def test_authorized_pages_not_cached(self):
+        """Авторизованный пользователь получает свежую страницу."""
+        self.warm_up()
+        for name, url in self.urls.items():
+            with self.subTest(name=name):
+                response = self.authorized_client.get(url)
+                self.assertIsNotNone(response.context)
+
+    def test_new_post_purges_its_pages(self):
+        """Новый пост сбрасывает ленту, группу и профиль автора."""
+        self.warm_up()
+        post = Post.objects.create(
+            author=self.author, text='Новый пост', group=self.group)
+        self.urls['new_detail'] = reverse(
+            'posts:post_detail', args=(post.pk,))
+        self.assertEqual(
+            self.cached(),
+            {'scnd_group', 'other_profile', 'detail', 'other_detail'})
+
+    def test_edit_purges_old_and_new_group(self):
+        """Перенос поста сбрасывает обе группы и страницу поста."""
+        self.warm_up()
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.scnd_group
+        post.save()
+        self.assertEqual(self.cached(), {'other_profile', 'other_detail'})
+
+    def test_delete_purges_its_pages(self):
+        """Удаление поста сбрасывает его страницы."""
+        self.warm_up()
+        Post.objects.get(pk=self.other_post.pk).delete()
+        self.assertEqual(
+            self.cached(), {'group', 'profile', 'detail'})
+
+
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='TestUser', first_name='Старое', last_name='Имя')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_card_shared_between_feeds(self):
+        """Карточка поста рендерится один раз для всех лент."""
+        self.guest_client.get(reverse('posts:index'))
+        # update() не трогает updated_at, поэтому ключ карточки прежний
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        url_list = (
+            reverse('posts:index'),
+            reverse('posts:profile', args=(self.author.username,)),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, 'Тестовый текст')
+        response = self.guest_client.get(
+            reverse('posts:group_list', args=(self.group.slug,)))
+        self.assertContains(response, 'Новый текст')
+
+    def test_rename_refreshes_card(self):
+        """Новое имя автора и название группы сразу видны в карточке."""
+        self.guest_client.get(reverse('posts:index'))
+        User.objects.filter(pk=self.author.pk).update(first_name='Новое')
+        Group.objects.filter(pk=self.group.pk).update(title='Новая группа')
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Новое Имя')
+        self.assertContains(response, 'Записи группы Новая группа')
+
+    def test_edit_refreshes_card(self):
+        """Правка поста обновляет его карточку."""
+        self.guest_client.get(reverse('posts:index'))
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Исправленный текст'
+        post.save()
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Исправленный текст')
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+
+    def test_not_modified(self):
+        """Актуальная копия клиента получает 304 за один запрос к БД."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertTrue(response.has_header('Last-Modified'))
+                with self.assertNumQueries(1):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(response.status_code, 304)
+
+    def test_modified_after_edit_and_on_other_page(self):
+        """Правка поста и другая страница дают новый ETag."""
+        etags = {url: self.guest_client.get(url)['ETag'] for url in self.urls}
+        response = self.guest_client.get(
+            self.urls[0], {'page': 2}, HTTP_IF_NONE_MATCH=etags[self.urls[0]])
+        self.assertEqual(response.status_code, 200)
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Исправленный текст'
+        post.save()
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+
+    def test_modified_after_group_and_author_edit(self):
+        """Правка группы или имени автора, видных в карточках, даёт новый
+        ETag на всех страницах с ними, а вход автора -- нет."""
+        etags = {url: self.guest_client.get(url)['ETag'] for url in self.urls}
+        self.client.force_login(self.author)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 304)
+        edits = (
+            (Group.objects.get(pk=self.group.pk), 'title', 'Новое название'),
+            (User.objects.get(pk=self.author.pk), 'first_name', 'Новое'),
+        )
+        for instance, field, value in edits:
+            etags = {
+                url: self.guest_client.get(url)['ETag'] for url in self.urls}
+            setattr(instance, field, value)
+            instance.save()
+            for url in self.urls:
+                with self.subTest(field=field, url=url):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etags[url])
+                    self.assertContains(response, value)
+
+    def test_modified_since_after_delete(self):
+        """Удаление не самого нового поста сдвигает Last-Modified."""
+        older = Post.objects.create(
+            author=self.author, text='Старый пост', group=self.group)
+        Post.objects.filter(pk=older.pk).update(
+            updated_at=self.post.updated_at - timedelta(days=1))
+        modified = {
+            url: self.guest_client.get(url)['Last-Modified']
+            for url in self.urls[:3]
+        }
+        older.delete()
+        for url, since in modified.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=since)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, 'Старый пост')
+
+    def test_modified_after_bulk_create_with_old_dates(self):
+        """Импорт пачкой со старыми датами тоже даёт новый ETag."""
+        etags = {url: self.guest_client.get(url)['ETag'] for url in self.urls}
+        Post.objects.bulk_create([
+            Post(author=self.author, text='Импорт', group=self.group)])
+        Post.objects.filter(text='Импорт').update(
+            updated_at=self.post.updated_at - timedelta(days=365))
+        for url in self.urls[:3]:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Импорт')
+
+    def test_validators_depend_on_user(self):
+        """Копия анонимного читателя не подходит авторизованному."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                response = self.authorized_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(response.has_header('Last-Modified'))
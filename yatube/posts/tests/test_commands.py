@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Group, ImportCheckpoint, Post, PostQuerySet, User
+
+
+class ImportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as target:
+            target.write(content)
+        return path
+
+    def jsonl(self, records):
+        return self.write('posts.jsonl', ''.join(
+            json.dumps(record, ensure_ascii=False) + '\n'
+            for record in records))
+
+    def test_import_jsonl(self):
+        """Импорт JSONL сохраняет дату, группу и пропускает чужих."""
+        path = self.jsonl([
+            {'text': 'Первый', 'author': 'TestUser', 'group': 'test_slug',
+             'pub_date': '2020-01-02T03:04:05+00:00'},
+            {'text': 'Второй', 'author': 'TestUser'},
+            {'text': 'Нет автора', 'author': 'Nobody'},
+            {'text': 'Нет группы', 'author': 'TestUser', 'group': 'none'},
+        ])
+        out = StringIO()
+        call_command(
+            'import_posts', path, batch_size=1, stdout=out, stderr=StringIO())
+        self.assertIn('Импортировано постов: 2, пропущено: 2', out.getvalue())
+        post = Post.objects.get(text='Первый')
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(post.pub_date.year, 2020)
+        self.assertEqual(post.updated_at, post.pub_date)
+        self.assertEqual(self.author.post_counter.post_count, 2)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+
+    def test_import_csv(self):
+        """Импорт CSV."""
+        path = self.write(
+            'posts.csv',
+            'text,author,group,pub_date\n'
+            '"Текст, с запятой",TestUser,test_slug,2021-05-06 07:08:09\n'
+            'Без группы,TestUser,,\n')
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(
+            set(Post.objects.values_list('text', flat=True)),
+            {'Текст, с запятой', 'Без группы'})
+        self.assertEqual(Group.objects.get(pk=self.group.pk).post_count, 1)
+
+    def test_resume_after_failure(self):
+        """После сбоя импорт продолжается с первой незаписанной пачки."""
+        path = self.jsonl([
+            {'text': 'Пост %s' % i, 'author': 'TestUser'} for i in range(5)])
+        bulk_create = PostQuerySet.bulk_create
+        calls = []
+
+        def failing(queryset, objs, *args, **kwargs):
+            calls.append(objs)
+            if len(calls) == 2:
+                raise RuntimeError('Сбой')
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        with mock.patch.object(PostQuerySet, 'bulk_create', failing):
+            with self.assertRaises(RuntimeError):
+                call_command(
+                    'import_posts', path, batch_size=2, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 2)
+        out = StringIO()
+        call_command('import_posts', path, batch_size=2, stdout=out)
+        self.assertIn('Продолжаем с записи 3', out.getvalue())
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Пост %s' % i for i in range(5)])
+
+    def test_progress_saved_with_batch(self):
+        """Сбой при записи прогресса откатывает и пачку постов."""
+        path = self.jsonl([
+            {'text': 'Пост %s' % i, 'author': 'TestUser'} for i in range(5)])
+        save = ImportCheckpoint.save
+        calls = []
+
+        def failing(checkpoint, *args, **kwargs):
+            calls.append(checkpoint.done)
+            if len(calls) == 3:
+                raise RuntimeError('Сбой')
+            return save(checkpoint, *args, **kwargs)
+
+        with mock.patch.object(ImportCheckpoint, 'save', failing):
+            with self.assertRaises(RuntimeError):
+                call_command(
+                    'import_posts', path, batch_size=2, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 2)
+        call_command('import_posts', path, batch_size=2, stdout=StringIO())
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Пост %s' % i for i in range(5)])
+
+
+class ExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        for i in range(3):
+            Post.objects.create(
+                author=cls.author, text='Пост %s' % i, group=cls.group)
+
+    def test_export_round_trip(self):
+        """Выгрузка читается обратно командой import_posts."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        paths = []
+        for file_format in ('jsonl', 'csv'):
+            with self.subTest(file_format=file_format):
+                paths.append(os.path.join(directory, 'posts.' + file_format))
+                err = StringIO()
+                call_command(
+                    'export_posts', group='test_slug', format=file_format,
+                    output=paths[-1], stderr=err)
+                self.assertIn('Выгружено записей: 3', err.getvalue())
+        for path in paths:
+            call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(Post.objects.filter(text='Пост 0').count(), 3)
@@ -1,7 +1,10 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
-from ..models import Group, Post
+from ..models import AuthorCounter, Group, Post, get_post_count
 
 User = get_user_model()
 
@@ -81,3 +84,65 @@ class PostModelTest(TestCase):
             with self.subTest(field=field):
                 self.assertEqual(task_post._meta.get_field(
                     field).help_text, expected_value)
+
+
+class PostCounterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Название тестовой группы',
+            slug='slug',
+            description='Описание тестовой группы',
+        )
+        cls.scnd_group = Group.objects.create(
+            title='Вторая группа',
+            slug='scnd_slug',
+            description='Описание второй группы',
+        )
+
+    def assertCounters(self, author, group, scnd_group):
+        self.user.refresh_from_db()
+        self.group.refresh_from_db()
+        self.scnd_group.refresh_from_db()
+        self.assertEqual(get_post_count(self.user), author)
+        self.assertEqual(self.group.post_count, group)
+        self.assertEqual(self.scnd_group.post_count, scnd_group)
+
+    def test_counters_follow_save_and_delete(self):
+        """Счётчики меняются при создании, правке и удалении поста."""
+        post = Post.objects.create(
+            author=self.user, text='Тестовый пост', group=self.group)
+        Post.objects.create(author=self.user, text='Без группы')
+        self.assertCounters(2, 1, 0)
+        post.group = self.scnd_group
+        post.save()
+        self.assertCounters(2, 0, 1)
+        post.delete()
+        self.assertCounters(1, 0, 0)
+
+    def test_counters_follow_bulk_create(self):
+        """Счётчики учитывают bulk_create."""
+        Post.objects.bulk_create([Post(
+            author=self.user, text='Тестовый пост', group=self.group,
+        ) for _ in range(3)])
+        self.assertCounters(3, 3, 0)
+        Post.objects.filter(group=self.group).delete()
+        self.assertCounters(0, 0, 0)
+
+    def test_rebuild_command_reports_drift(self):
+        """Команда пересчёта находит и исправляет расхождения."""
+        Post.objects.create(
+            author=self.user, text='Тестовый пост', group=self.group)
+        AuthorCounter.objects.filter(author=self.user).update(post_count=5)
+        Group.objects.filter(pk=self.scnd_group.pk).update(post_count=2)
+        out = StringIO()
+        call_command('rebuild_post_counters', '--dry-run', stdout=out)
+        self.assertIn('Расхождений: 2', out.getvalue())
+        self.assertCounters(5, 1, 2)
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertCounters(1, 1, 0)
+        out = StringIO()
+        call_command('rebuild_post_counters', stdout=out)
+        self.assertIn('Расхождений нет', out.getvalue())
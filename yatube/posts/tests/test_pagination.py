@@ -0,0 +1,213 @@
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from yatube.settings import POSTS_ON_PAGE
+from yatube.utils import (PAGE_ELLIPSIS, CachedCountPaginator, KeysetPage,
+                          KeysetPaginator, elided_page_range)
+
+from ..models import Group, Post, User
+
+
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        Post.objects.bulk_create([Post(
+            text='Тестовый текст %s' % i,
+            group=cls.group,
+            author=cls.author,
+        ) for i in range(POSTS_ON_PAGE * 2 + 3)])
+        cls.expected = list(Post.objects.order_by(
+            '-pub_date', '-id').values_list('id', flat=True))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def walk(self, paginator, forward=True):
+        """Обход всех страниц по курсорам в одном направлении."""
+        page = paginator.get_page()
+        pages = [page]
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            pages.append(page)
+        if forward:
+            return pages
+        pages = [page]
+        while page.has_previous():
+            page = paginator.get_page(page.previous_cursor)
+            pages.append(page)
+        return pages
+
+    def test_forward_and_backward_walk(self):
+        """Курсоры вперёд и назад проходят все посты без пропусков."""
+        paginator = KeysetPaginator(Post.objects.all(), POSTS_ON_PAGE)
+        pages = self.walk(paginator)
+        for previous, page in zip(pages, pages[1:]):
+            self.assertEqual(page.cursor, previous.next_cursor)
+        forward = [post.id for page in pages for post in page]
+        self.assertEqual(forward, self.expected)
+        backward = [post.id for page in reversed(self.walk(paginator, False))
+                    for post in page]
+        self.assertEqual(backward, self.expected)
+
+    def test_broken_cursor_returns_first_page(self):
+        """Испорченный курсор отдаёт первую страницу."""
+        paginator = KeysetPaginator(Post.objects.all(), POSTS_ON_PAGE)
+        for cursor in ('', 'мусор', 'bnxub3QtYS1kYXRlfDE'):
+            with self.subTest(cursor=cursor):
+                page = paginator.get_page(cursor)
+                self.assertFalse(page.has_previous())
+                self.assertIsNone(page.cursor)
+                self.assertEqual(
+                    [post.id for post in page],
+                    self.expected[:POSTS_ON_PAGE])
+
+    def test_feed_views_cursor_mode(self):
+        """Ленты в режиме курсора не выполняют COUNT(*)."""
+        url_list = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'TestUser'}),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url, {'cursor': ''})
+                page_obj = response.context['page_obj']
+                self.assertIsInstance(page_obj, KeysetPage)
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.guest_client.get(
+                        url, {'cursor': page_obj.next_cursor})
+                self.assertEqual(
+                    [post.id for post in response.context['page_obj']],
+                    self.expected[POSTS_ON_PAGE:POSTS_ON_PAGE * 2])
+                self.assertFalse(any(
+                    'COUNT(' in query['sql'] for query in queries))
+                self.assertFalse(any(
+                    'OFFSET' in query['sql'] for query in queries))
+
+    @override_settings(PAGINATION_MODE='cursor')
+    def test_numbered_mode_on_request(self):
+        """Параметр page возвращает обычный постраничный режим."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertIsInstance(response.context['page_obj'], KeysetPage)
+        response = self.guest_client.get(reverse('posts:index'), {'page': 2})
+        self.assertIsInstance(response.context['page_obj'], Page)
+
+
+class CachedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        Post.objects.bulk_create([Post(
+            text='Тестовый текст %s' % i,
+            group=cls.group,
+            author=cls.author,
+        ) for i in range(POSTS_ON_PAGE + 1)])
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(url)
+        return response, sum('COUNT(' in query['sql'] for query in queries)
+
+    def test_count_cached_per_scope(self):
+        """COUNT(*) общей ленты выполняется один раз, у групп и авторов
+        число берётся из счётчиков без COUNT(*)."""
+        url = reverse('posts:index')
+        self.assertEqual(self.count_queries(url)[1], 1)
+        self.assertEqual(self.count_queries(url + '?page=2')[1], 0)
+        url_list = (
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'TestUser'}),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                response, counts = self.count_queries(url)
+                self.assertEqual(counts, 0)
+                self.assertEqual(
+                    response.context['page_obj'].paginator.count,
+                    POSTS_ON_PAGE + 1)
+
+    def test_count_invalidated_on_create_and_delete(self):
+        """Создание и удаление поста сбрасывают число постов общей ленты,
+        правка текста -- нет."""
+        url = reverse('posts:index')
+        self.count_queries(url)
+        post = Post.objects.create(
+            author=self.author, text='Новый пост', group=self.group)
+        response, counts = self.count_queries(url)
+        self.assertEqual(counts, 1)
+        self.assertEqual(
+            response.context['page_obj'].paginator.count, POSTS_ON_PAGE + 2)
+        post.text = 'Исправленный пост'
+        post.save()
+        self.assertEqual(self.count_queries(url)[1], 0)
+        post.delete()
+        response, counts = self.count_queries(url)
+        self.assertEqual(counts, 1)
+        self.assertEqual(
+            response.context['page_obj'].paginator.count, POSTS_ON_PAGE + 1)
+        response = self.guest_client.get(
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}))
+        self.assertEqual(
+            response.context['page_obj'].paginator.count, POSTS_ON_PAGE + 1)
+
+    def test_estimated_count_for_large_scopes(self):
+        """Оценка заменяет COUNT(*), начиная с заданного порога."""
+        with self.settings(PAGE_COUNT_ESTIMATE_THRESHOLD=100):
+            paginator = CachedCountPaginator(
+                Post.objects.all(), POSTS_ON_PAGE, 'global', lambda: 500)
+            self.assertEqual(paginator.count, 500)
+            cache.clear()
+            paginator = CachedCountPaginator(
+                Post.objects.all(), POSTS_ON_PAGE, 'global', lambda: 50)
+            self.assertEqual(paginator.count, POSTS_ON_PAGE + 1)
+
+
+class ElidedPageRangeTest(TestCase):
+    def pages(self, number, num_pages):
+        paginator = Paginator(range(num_pages * POSTS_ON_PAGE), POSTS_ON_PAGE)
+        return elided_page_range(paginator.page(number))
+
+    def test_elided_page_range(self):
+        """Первая, последняя и соседние страницы, пропуски -- многоточие."""
+        cases = (
+            (1, 3, [1, 2, 3]),
+            (4, 7, [1, 2, 3, 4, 5, 6, 7]),
+            (1, 1000, [1, 2, 3, PAGE_ELLIPSIS, 1000]),
+            (500, 1000,
+             [1, PAGE_ELLIPSIS, 498, 499, 500, 501, 502, PAGE_ELLIPSIS,
+              1000]),
+            (1000, 1000, [1, PAGE_ELLIPSIS, 998, 999, 1000]),
+        )
+        for number, num_pages, expected in cases:
+            with self.subTest(number=number, num_pages=num_pages):
+                self.assertEqual(self.pages(number, num_pages), expected)
+
+    def test_navigation_size_does_not_depend_on_pages(self):
+        """Навигация ленты не растёт вместе с числом страниц."""
+        author = User.objects.create_user(username='TestUser')
+        Post.objects.bulk_create([
+            Post(author=author, text='Пост %s' % i) for i in range(300)])
+        response = self.client.get(reverse('posts:index'), {'page': 15})
+        self.assertEqual(
+            response.content.decode().count('class="page-item'), 13)
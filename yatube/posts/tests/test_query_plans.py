@@ -0,0 +1,90 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from yatube.settings import POSTS_ON_PAGE
+
+from ..models import Group, Post, User
+
+# Полный проход по таблице без индекса: «SCAN posts_post», в SQLite
+# до 3.36 -- «SCAN TABLE posts_post»
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?\w+$')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+class FeedQueryPlanTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        Post.objects.bulk_create([Post(
+            text='Тестовый текст %s' % i,
+            group=cls.group if i % 2 else None,
+            author=cls.author,
+        ) for i in range(POSTS_ON_PAGE * 3)])
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def query_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def view_queries(self, url, data=None):
+        """SQL-запросы к постам, выполненные view."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(url, data)
+        return response, [
+            query['sql'] for query in queries
+            if 'posts_post' in query['sql']
+        ]
+
+    def test_full_scan_pattern(self):
+        """Полный проход узнаётся в записи новых и старых SQLite."""
+        for line in ('SCAN posts_post', 'SCAN TABLE posts_post'):
+            with self.subTest(line=line):
+                self.assertRegex(line, FULL_SCAN)
+        self.assertNotRegex(
+            'SEARCH posts_post USING INDEX post_feed_idx', FULL_SCAN)
+        self.assertNotRegex(
+            'SCAN TABLE posts_post USING INDEX post_feed_idx', FULL_SCAN)
+
+    def test_feed_views_use_indexes(self):
+        """Запросы лент не сканируют таблицу и не сортируют во временном
+        B-дереве."""
+        url_list = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile', kwargs={'username': 'TestUser'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+        for url in url_list:
+            for data in ({}, {'page': 2}, {'cursor': ''}):
+                response, queries = self.view_queries(url, data)
+                page_obj = response.context.get('page_obj')
+                if getattr(page_obj, 'next_cursor', None):
+                    queries += self.view_queries(
+                        url, {'cursor': page_obj.next_cursor})[1]
+                for sql in queries:
+                    with self.subTest(url=url, sql=sql):
+                        plan = self.query_plan(sql)
+                        self.assertFalse(
+                            [line for line in plan
+                             if FULL_SCAN.search(line) or TEMP_SORT in line],
+                            plan)
@@ -1,5 +1,12 @@
+import csv
+import json
+
+from io import StringIO
 
 from django import forms
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import Client, TestCase
 from django.urls import reverse
 
@@ -200,3 +207,176 @@ class PostPagesTest(TestCase):
                 self.assertEqual(
                     len(response.context['page_obj']),
                     self.paginator.count % POSTS_ON_PAGE)
+
+
+class PostQueryCountTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='TestUser', first_name='Имя', last_name='Фамилия')
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.posts = Post.objects.bulk_create([Post(
+            text='Тестовый текст %s' % i,
+            group=cls.group,
+            author=User.objects.create_user(username='user%s' % i),
+        ) for i in range(POSTS_ON_PAGE)])
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый текст',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_views_query_count(self):
+        """Число запросов views не зависит от числа постов на странице."""
+        # Первый запрос каждой view -- валидаторы условного GET
+        url_queries = {
+            reverse('posts:index'): 3,
+            reverse('posts:group_list', kwargs={'slug': 'test_slug'}): 3,
+            reverse('posts:profile', kwargs={'username': 'TestUser'}): 3,
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}): 2,
+        }
+        for url, queries in url_queries.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(url)
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Котики и собачки',
+        )
+        cls.best_post = Post.objects.create(
+            author=cls.author,
+            text='Котики, котики и ещё раз котики',
+        )
+        Post.objects.bulk_create([Post(
+            author=cls.author,
+            text='Просто текст %s' % i,
+        ) for i in range(POSTS_ON_PAGE)])
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query, **params):
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': query, **params})
+        return [post.pk for post in response.context['page_obj']]
+
+    def test_search_ranked(self):
+        """Поиск находит посты и ставит выше более релевантные."""
+        self.assertEqual(
+            self.search('КОТИКИ'), [self.best_post.pk, self.post.pk])
+        self.assertEqual(self.search('собач'), [self.post.pk])
+        self.assertEqual(self.search('котики "собачки'), [self.post.pk])
+        self.assertEqual(self.search(''), [])
+
+    def test_search_index_follows_changes(self):
+        """Индекс обновляется при правке, удалении и bulk_create."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Только собачки'
+        post.save()
+        self.assertEqual(self.search('котики'), [self.best_post.pk])
+        Post.objects.filter(pk=self.best_post.pk).delete()
+        self.assertEqual(self.search('котики'), [])
+        self.assertEqual(len(self.search('текст')), POSTS_ON_PAGE)
+
+    def test_rebuild_search_index(self):
+        """Команда перестраивает индекс по существующим постам."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM posts_post_fts')
+        self.assertEqual(self.search('котики'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search('котики')), 2)
+
+
+class PostExportTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='TestUser')
+        cls.staff = User.objects.create_user(
+            username='Staff', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Тест группа',
+            slug='test_slug',
+            description='Описание',
+        )
+        cls.posts = [Post.objects.create(
+            author=cls.author,
+            text='Пост %s' % i,
+            group=cls.group if i % 2 else None,
+        ) for i in range(4)]
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def export(self, client, url, **params):
+        response = client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_access(self):
+        """Выгрузка только для вошедших, всего сайта -- для персонала."""
+        url_list = (
+            reverse('posts:export'),
+            reverse('posts:group_export', args=(self.group.slug,)),
+            reverse('posts:profile_export', args=(self.author.username,)),
+        )
+        for url in url_list:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 302)
+        response = self.authorized_client.get(reverse('posts:export'))
+        self.assertEqual(response.status_code, 302)
+        self.export(self.staff_client, reverse('posts:export'))
+
+    def test_export_formats(self):
+        """JSONL и CSV от старых постов к новым."""
+        lines = self.export(
+            self.authorized_client,
+            reverse('posts:profile_export', args=(self.author.username,)))
+        rows = [json.loads(line) for line in lines.splitlines()]
+        self.assertEqual(
+            [row['text'] for row in rows], ['Пост %s' % i for i in range(4)])
+        self.assertEqual(rows[1]['group'], self.group.slug)
+        lines = self.export(
+            self.authorized_client,
+            reverse('posts:group_export', args=(self.group.slug,)),
+            format='csv')
+        rows = list(csv.DictReader(StringIO(lines)))
+        self.assertEqual(
+            [row['text'] for row in rows], ['Пост 1', 'Пост 3'])
+
+    def test_export_since(self):
+        """since и since_id продолжают выгрузку с последней строки."""
+        url = reverse('posts:export')
+        rows = [json.loads(line) for line in self.export(
+            self.staff_client, url).splitlines()]
+        last = rows[1]
+        lines = self.export(
+            self.staff_client, url,
+            since=last['pub_date'], since_id=last['id'])
+        self.assertEqual(
+            [json.loads(line)['id'] for line in lines.splitlines()],
+            [row['id'] for row in rows[2:]])
+        response = self.staff_client.get(url, {'since': 'вчера'})
+        self.assertEqual(response.status_code, 400)
@@ -9,10 +9,19 @@ urlpatterns = [
 
     path('group/<slug>/', views.group_posts, name='group_list'),
 
+    path('group/<slug>/export/', views.group_export, name='group_export'),
+
     path('profile/<str:username>/', views.profile, name='profile'),
 
+    path('profile/<str:username>/export/', views.profile_export,
+         name='profile_export'),
+
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
 
+    path('search/', views.search, name='search'),
+
+    path('export/', views.export_all, name='export'),
+
     path('create/', views.post_create, name='post_create'),
 
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit')
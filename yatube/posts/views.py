@@ -1,26 +1,46 @@
+from urllib.parse import urlencode
+
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from yatube.settings import POSTS_ON_PAGE
+
+from core.ratelimit import ratelimit
 from yatube.utils import pagination
 
+from .cache import GLOBAL_SCOPE, anonymous_cache_page, feed_condition
+from .export import (CONTENT_TYPES, EXPORT_FORMATS, export_rows,
+                     parse_since, render_rows)
 from .forms import PostForm
-from .models import Group, Post, User
+from .models import Group, Post, User, get_post_count
+from .search import search_posts
 
 
+@feed_condition(lambda: Post.objects.last_modified())
+@anonymous_cache_page
 def index(request):
     template = 'posts/index.html'
-    posts = pagination(request, Post.objects.all())
+    posts = pagination(
+        request, Post.objects.feed(), GLOBAL_SCOPE,
+        Post.objects.estimated_count)
     context = {
         'page_obj': posts
     }
     return render(request, template, context)
 
 
+@feed_condition(
+    lambda slug: Post.objects.filter(group__slug=slug).last_modified())
+@anonymous_cache_page
 def group_posts(request, slug):
     group_template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = pagination(request, posts)
+    posts = group.posts.feed()
+    paginator = pagination(request, posts, known_count=group.post_count)
     context = {
         'group': group,
         'page_obj': paginator,
@@ -28,12 +48,17 @@ def group_posts(request, slug):
     return render(request, group_template, context)
 
 
+@feed_condition(
+    lambda username: Post.objects.filter(
+        author__username=username).last_modified())
+@anonymous_cache_page
 def profile(request, username):
     profile_template = 'posts/profile.html'
-    user = get_object_or_404(User, username=username)
-    posts = user.posts.all()
-    paginator = pagination(request, posts)
-    count = user.posts.count()
+    user = get_object_or_404(
+        User.objects.select_related('post_counter'), username=username)
+    posts = user.posts.feed()
+    count = get_post_count(user)
+    paginator = pagination(request, posts, known_count=count)
     context = {
         'page_obj': paginator,
         'author': user,
@@ -42,10 +67,14 @@ def profile(request, username):
     return render(request, profile_template, context)
 
 
+@feed_condition(
+    lambda post_id: Post.objects.filter(pk=post_id).last_modified(
+        count=Max('author__post_counter__post_count')))
+@anonymous_cache_page
 def post_detail(request, post_id):
     post_detail_template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, pk=post_id)
-    post_count = post.author.posts.count()
+    post = get_object_or_404(Post.objects.detail(), pk=post_id)
+    post_count = get_post_count(post.author)
     context = {
         'post': post,
         'author': post.author,
@@ -54,7 +83,55 @@ def post_detail(request, post_id):
     return render(request, post_detail_template, context)
 
 
+def search(request):
+    search_template = 'posts/search.html'
+    query = request.GET.get('q', '').strip()
+    posts = search_posts(Post.objects.feed(), query)
+    paginator = Paginator(posts, POSTS_ON_PAGE)
+    context = {
+        'query': query,
+        'page_obj': paginator.get_page(request.GET.get('page')),
+        'page_query': urlencode({'q': query}) + '&',
+    }
+    return render(request, search_template, context)
+
+
+def export_response(request, name, **filters):
+    export_format = request.GET.get('format', 'jsonl')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest('Неизвестный формат')
+    try:
+        since = parse_since(
+            request.GET.get('since'), request.GET.get('since_id'))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = StreamingHttpResponse(
+        render_rows(export_rows(since=since, **filters), export_format),
+        content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = (
+        'attachment; filename="%s.%s"' % (name, export_format))
+    return response
+
+
+@staff_member_required
+def export_all(request):
+    return export_response(request, 'posts')
+
+
+@login_required
+def group_export(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return export_response(request, 'group-%s' % group.slug, group=group)
+
+
+@login_required
+def profile_export(request, username):
+    user = get_object_or_404(User, username=username)
+    return export_response(request, 'posts-%s' % user.username, author=user)
+
+
 @ login_required
+@ratelimit('post_create')
 def post_create(request):
     create_post_template = 'posts/create_post.html'
     group = Group.objects.all()
@@ -71,6 +148,7 @@ def post_create(request):
     return render(request, create_post_template, context)
 
 
+@ratelimit('post_edit')
 def post_edit(request, post_id):
     post_edit_template = 'posts/create_post.html'
     post = get_object_or_404(Post, pk=post_id)
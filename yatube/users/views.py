@@ -2,6 +2,8 @@ from django.contrib.auth.views import PasswordChangeView, PasswordResetView
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
 
+from core.ratelimit import ratelimit
+
 from .forms import ContactForm, CreationForm
 
 
@@ -15,6 +17,7 @@ class PasswordChangeDone(PasswordChangeView):
     template_name = 'users/password_change_form.html'
 
 
+@ratelimit('sign_up')
 def sign_up(request):
     sign_up_template = 'users/signup.html'
     form = CreationForm(request.POST or None)
@@ -36,6 +36,41 @@ ALLOWED_HOSTS = [
 
 POSTS_ON_PAGE = 10
 
+# 'numbered' -- ?page=N, 'cursor' -- ?cursor=<token> без подсчёта страниц
+PAGINATION_MODE = 'numbered'
+
+# Сколько секунд хранить в кэше число постов ленты
+PAGE_COUNT_CACHE_SECONDS = 60 * 5
+# С какого размера ленты брать оценку числа постов вместо COUNT(*);
+# None -- всегда точный подсчёт
+PAGE_COUNT_ESTIMATE_THRESHOLD = None
+# Сколько секунд хранить страницы лент для анонимных читателей;
+# 0 -- не кэшировать (при отладке нужны свежие страницы и их контекст).
+# Страницы и их версии лежат в CACHES['default']: при нескольких
+# процессах нужен общий кэш (memcached, redis), иначе сброс после
+# правки или удаления поста видит только процесс, который его сделал
+FEED_CACHE_SECONDS = 0 if DEBUG else 60
+# Сколько секунд хранить карточку поста, общую для всех лент; ключ
+# меняется при правке поста, автора (имя) и группы (название)
+POST_CARD_CACHE_SECONDS = 60 * 10
+
+# Заголовок Server-Timing со временем SQL и шаблонов для каждого запроса
+SQL_TIMING_ENABLED = False
+# С какого суммарного времени SQL за запрос писать в лог планы запросов
+SQL_TIMING_THRESHOLD_MS = 200
+# Сколько самых медленных запросов писать в лог
+SQL_TIMING_SLOWEST = 3
+
+# Профилирование cProfile и tracemalloc доли запросов
+PROFILING_ENABLED = False
+PROFILING_SAMPLE_RATE = 0.01
+# Дампы сохраняются только для запросов не короче этого времени
+PROFILING_THRESHOLD_MS = 500
+PROFILING_TOP_ALLOCATIONS = 20
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles')
+# Старые дампы удаляются, когда каталог становится больше этого размера
+PROFILING_MAX_BYTES = 50 * 1024 * 1024
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -43,6 +78,7 @@ INSTALLED_APPS = [
     'core.apps.CoreConfig',
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -53,6 +89,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.sql_timing.SqlTimingMiddleware',
+    'core.middleware.profiling.ProfilingMiddleware',
+    'core.middleware.replica.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,18 +106,29 @@ ROOT_URLCONF = 'yatube.urls'
 # Templates directory:
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+TEMPLATE_SOURCE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # При отладке шаблоны читаются с диска на каждый запрос,
+            # иначе компилируются один раз (прогрев -- в wsgi.py)
+            'loaders': TEMPLATE_SOURCE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader',
+                 TEMPLATE_SOURCE_LOADERS),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.cache.cache_timeouts',
             ],
         },
     },
@@ -92,8 +142,48 @@ WSGI_APPLICATION = 'yatube.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # SQLite с WAL и busy_timeout: см. core/backends/sqlite3/base.py
+        'ENGINE': 'core.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Соединение живёт между запросами, PRAGMA выполняются один раз
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            # Переопределяют core.backends.sqlite3.base.DEFAULT_PRAGMAS
+            'pragmas': {},
+        },
+    }
+}
+
+# Реплика для чтения лент: например, REPLICA_DB_NAME=replica.sqlite3
+# (копию основной базы поддерживает внешний инструмент репликации)
+if os.environ.get('REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['REPLICA_DB_NAME'],
+    }
+
+# Псевдонимы баз, из которых читают запросы; пусто -- только default
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Сколько секунд после записи клиент читает из основной базы
+REPLICA_PIN_SECONDS = 10
+REPLICA_PIN_COOKIE = 'pin_primary'
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/ref/settings/#caches
+
+CACHES = {
+    'default': {
+        # Память процесса подходит для одного процесса; при нескольких
+        # нужен общий кэш (memcached, redis): в нём версии страниц,
+        # сессии, пользователи и вёдра RATELIMITS
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            # Страницы лент не должны вытеснять сессии и пользователей
+            # (по умолчанию всего 300 записей)
+            'MAX_ENTRIES': 10000,
+        },
     }
 }
 
@@ -136,11 +226,77 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
-
+# Куда collectstatic собирает файлы с хэшами и их сжатые копии
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+if not DEBUG:
+    STATICFILES_STORAGE = (
+        'core.storage.CompressedManifestStaticFilesStorage')
+# Раздавать STATIC_ROOT самим приложением (без отдельного веб-сервера)
+STATIC_SERVE = not DEBUG
+# Время кэширования файлов без хэша в имени, в секундах
+STATIC_MAX_AGE = 60 * 60
+
+
+# Сессии: память процесса, общий кэш, база (core/sessions.py);
+# сохраняются только при изменении
+SESSION_ENGINE = 'core.sessions'
+SESSION_SAVE_EVERY_REQUEST = False
+# Пользователь сессии тоже берётся из кэша (core/auth.py). ModelBackend
+# остаётся для сессий, созданных до CachedModelBackend: в сессии записан
+# путь backend, и без него такие пользователи оказались бы разлогинены
+AUTHENTICATION_BACKENDS = [
+    'core.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_SECONDS = 60 * 60
+# Сколько секунд воркер держит сессию и пользователя в своей памяти;
+# столько же другие воркеры могут не видеть выход или смену пароля
+LOCAL_CACHE_SECONDS = 5
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма попадают в очередь (core.models.OutgoingEmail), отправляет их
+# manage.py send_queued_mail через EMAIL_QUEUE_BACKEND
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+EMAIL_QUEUE_BATCH_SIZE = 50
+EMAIL_QUEUE_POLL_SECONDS = 2
+# Через сколько секунд письмо упавшего воркера снова в очереди
+EMAIL_QUEUE_LEASE_SECONDS = 5 * 60
+EMAIL_QUEUE_MAX_ATTEMPTS = 6
+EMAIL_QUEUE_RETRY_BASE_SECONDS = 30
+EMAIL_QUEUE_RETRY_MAX_SECONDS = 60 * 60
+
+
+# Фоновые задачи (core.models.Job, регистрируются в <app>/jobs.py),
+# выполняет их manage.py run_workers
+JOBS_WORKERS = 2
+JOBS_BATCH_SIZE = 20
+JOBS_POLL_SECONDS = 1
+# Через сколько секунд задачи упавшего воркера снова в очереди
+JOBS_LEASE_SECONDS = 5 * 60
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BASE_SECONDS = 10
+JOBS_RETRY_MAX_SECONDS = 60 * 60
+
+
+# Ограничение частоты изменяющих запросов (core/ratelimit.py):
+# имя -> (запросов, за секунд), ведро на пользователя или IP анонима
+RATELIMITS = {
+    'post_create': (10, 60),
+    'post_edit': (30, 60),
+    'sign_up': (5, 60 * 60),
+}
+# CacheBackend -- общий лимит для процессов с общим CACHES,
+# LocalBackend -- отдельный лимит в памяти каждого процесса
+RATELIMIT_BACKEND = 'core.ratelimit.CacheBackend'
+# Заголовок из request.META с IP клиента за обратным прокси, например
+# 'HTTP_X_FORWARDED_FOR' или 'HTTP_X_REAL_IP'; из списка берётся
+# последний адрес. None -- REMOTE_ADDR: за прокси это адрес прокси,
+# и все анонимы делят одно ведро. Задавайте, только если прокси
+# всегда перезаписывает или дописывает этот заголовок -- иначе клиент
+# подставит любой IP и обойдёт лимит
+RATELIMIT_CLIENT_IP_HEADER = None
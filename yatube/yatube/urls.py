@@ -13,8 +13,11 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.views import serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,4 +29,12 @@ urlpatterns = [
     path('auth/', include('django.contrib.auth.urls')),
 
     path('about/', include('about.urls', namespace='about')),
+
+    path('api/v1/', include('api.urls', namespace='api')),
 ]
+
+if settings.STATIC_SERVE:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % settings.STATIC_URL.lstrip('/'),
+                serve_static),
+    ]
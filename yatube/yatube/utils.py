@@ -1,10 +1,263 @@
+import base64
+import binascii
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 
 from yatube.settings import POSTS_ON_PAGE
 
+PAGE_ELLIPSIS = '…'
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+CURSOR_SEPARATOR = '|'
+
+
+def encode_cursor(direction, values):
+    raw = CURSOR_SEPARATOR.join([direction] + [str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор в пару (направление, значения ключей) или None."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, *values = raw.decode().split(CURSOR_SEPARATOR)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+        return None
+    return direction, values
+
+
+class KeysetPage(Sequence):
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor,
+                 cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # Курсор этой страницы в каноническом виде; None -- первая страница
+        self.cursor = cursor
+
+    def __repr__(self):
+        return '<KeysetPage of %s objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+
+class KeysetPaginator:
+    """Постраничный вывод по курсору без COUNT(*) и OFFSET.
+
+    Страница выбирается индексным поиском по ключам сортировки
+    (по умолчанию ``pub_date`` и ``id``, от новых к старым).
+    """
+
+    def __init__(self, object_list, per_page, keys=('pub_date', 'id')):
+        self.keys = keys
+        self.per_page = per_page
+        self.object_list = object_list.order_by(*('-' + key for key in keys))
+
+    def key_values(self, obj):
+        if isinstance(obj, dict):
+            return [obj[key] for key in self.keys]
+        return [getattr(obj, key) for key in self.keys]
+
+    def to_python(self, values):
+        opts = self.object_list.model._meta
+        return [opts.get_field(key).to_python(value)
+                for key, value in zip(self.keys, values)]
+
+    def seek(self, values, lookup):
+        """Условие «строго после (до) values» в порядке сортировки ключей."""
+        condition = Q()
+        for position in reversed(range(len(self.keys))):
+            key, value = self.keys[position], values[position]
+            strict = Q(**{'%s__%s' % (key, lookup): value})
+            condition = strict if not condition else strict | (
+                Q(**{key: value}) & condition)
+        first_key, first_value = self.keys[0], values[0]
+        bound = Q(**{'%s__%se' % (first_key, lookup): first_value})
+        return bound & condition
+
+    def get_page(self, cursor=None):
+        decoded = decode_cursor(cursor)
+        values = None
+        if decoded is not None and len(decoded[1]) == len(self.keys):
+            try:
+                values = self.to_python(decoded[1])
+            except ValidationError:
+                values = None
+        cursor = None
+        if values is None:
+            direction = CURSOR_NEXT
+            queryset = self.object_list
+        elif decoded[0] == CURSOR_NEXT:
+            direction = CURSOR_NEXT
+            queryset = self.object_list.filter(self.seek(values, 'lt'))
+        else:
+            direction = CURSOR_PREVIOUS
+            queryset = self.object_list.filter(
+                self.seek(values, 'gt')).reverse()
+        if values is not None:
+            cursor = encode_cursor(direction, values)
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == CURSOR_PREVIOUS:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(
+                CURSOR_NEXT, self.key_values(rows[-1]))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(
+                CURSOR_PREVIOUS, self.key_values(rows[0]))
+        return KeysetPage(
+            rows, self, next_cursor, previous_cursor, cursor=cursor)
+
+
+def page_count_key(scope):
+    return 'page_count:%s' % scope
+
+
+def invalidate_page_counts(*scopes):
+    """Сбрасывает закэшированные счётчики сразу и после коммита."""
+    keys = [page_count_key(scope) for scope in scopes]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт число объектов из кэша по области ленты.
+
+    scope -- имя области (например, 'global'),
+    estimate -- функция дешёвой оценки числа объектов; оценка используется
+    вместо COUNT(*), когда она не меньше PAGE_COUNT_ESTIMATE_THRESHOLD,
+    known_count -- точное число, уже известное из счётчика: с ним нет
+    ни COUNT(*), ни обращения к кэшу.
+    """
+
+    def __init__(self, object_list, per_page, scope=None, estimate=None,
+                 known_count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.scope = scope
+        self.estimate = estimate
+        self.known_count = known_count
+
+    def get_count(self):
+        threshold = settings.PAGE_COUNT_ESTIMATE_THRESHOLD
+        if self.estimate is not None and threshold is not None:
+            estimated = self.estimate()
+            if estimated >= threshold:
+                return estimated
+        return self.object_list.count()
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        if self.scope is None:
+            return self.get_count()
+        key = page_count_key(self.scope)
+        count = cache.get(key)
+        if count is None:
+            count = self.get_count()
+            cache.set(key, count, settings.PAGE_COUNT_CACHE_SECONDS)
+        return count
+
+
+def elided_page_range(page_obj, on_each_side=2, on_ends=1):
+    """Номера страниц для навигации: первые и последние on_ends страниц
+    и по on_each_side вокруг текущей, пропуски -- PAGE_ELLIPSIS.
+
+    Длина списка не зависит от числа страниц.
+    """
+    number = page_obj.number
+    num_pages = page_obj.paginator.num_pages
+    if num_pages <= (on_each_side + on_ends) * 2 + 1:
+        return list(range(1, num_pages + 1))
+    pages = []
+    if number > on_each_side + on_ends + 1:
+        pages += list(range(1, on_ends + 1)) + [PAGE_ELLIPSIS]
+        pages += list(range(number - on_each_side, number + 1))
+    else:
+        pages += list(range(1, number + 1))
+    if number < num_pages - on_each_side - on_ends:
+        pages += list(range(number + 1, number + on_each_side + 1))
+        pages += [PAGE_ELLIPSIS]
+        pages += list(range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        pages += list(range(number + 1, num_pages + 1))
+    return pages
+
+
+def uses_cursor(request):
+    cursor_mode = settings.PAGINATION_MODE == 'cursor'
+    return 'cursor' in request.GET or (
+        cursor_mode and 'page' not in request.GET)
+
+
+def requested_position(request):
+    """Страница, которую просит запрос, в каноническом виде:
+    ('cursor', курсор) или ('page', номер).
+
+    Как и пагинаторы, нечисловой номер считается первой страницей,
+    а испорченный курсор -- первой страницей ленты по курсору.
+    """
+    if uses_cursor(request):
+        decoded = decode_cursor(request.GET.get('cursor'))
+        return 'cursor', encode_cursor(*decoded) if decoded else ''
+    try:
+        return 'page', str(int(request.GET.get('page', '')))
+    except ValueError:
+        return 'page', '1'
+
+
+def pagination(request, object_list, scope=None, estimate=None,
+               known_count=None):
+    """Страница ленты по параметрам page или cursor.
 
-def pagination(request, object_list):
-    paginator = Paginator(object_list, POSTS_ON_PAGE)
+    Страница, которую пагинатор выбрал на самом деле, сохраняется
+    в request.page_position в виде requested_position: по ней видно,
+    что номер был вне диапазона или курсор не разобран.
+    """
+    if uses_cursor(request):
+        paginator = KeysetPaginator(object_list, POSTS_ON_PAGE)
+        page_obj = paginator.get_page(request.GET.get('cursor'))
+        request.page_position = 'cursor', page_obj.cursor or ''
+        return page_obj
+    paginator = CachedCountPaginator(
+        object_list, POSTS_ON_PAGE, scope=scope, estimate=estimate,
+        known_count=known_count)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    request.page_position = 'page', str(page_obj.number)
     return page_obj